@@ -5,9 +5,11 @@ from .models.customUser import CustomUser
 from .models.priority import Priority
 from .models.state import State
 from .models.tasks import Task
+from .models.token_blacklist import BlacklistedToken
 
 admin.site.register(Task)
 admin.site.register(Priority)
 admin.site.register(State)
 admin.site.register(CustomUser)
 admin.site.register(Comment)
+admin.site.register(BlacklistedToken)
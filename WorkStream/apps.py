@@ -6,4 +6,5 @@ class WorkStreamConfig(AppConfig):
     name = "WorkStream"
 
     def ready(self):
+        import WorkStream.checks
         import WorkStream.signals
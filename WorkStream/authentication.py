@@ -0,0 +1,167 @@
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import DEFERRED
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import BasicAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from WorkStream.models import CustomUser
+from WorkStream.ttl_cache import TTLCache
+
+
+def auth_local_ttl():
+    return getattr(settings, "WORKSTREAM_AUTH_LOCAL_TTL", 5)
+
+
+def auth_shared_ttl():
+    return getattr(settings, "WORKSTREAM_AUTH_SHARED_TTL", 300)
+
+
+def basic_auth_ttl():
+    return getattr(settings, "WORKSTREAM_BASIC_AUTH_TTL", 60)
+
+
+_users = TTLCache(ttl=auth_local_ttl)
+_credentials = TTLCache(ttl=basic_auth_ttl)
+
+
+def user_cache_key(user_id):
+    return f"workstream:auth:user:{user_id}"
+
+
+def normalize_user_id(value):
+    """
+    Id de usuario con el tipo de la clave primaria. simplejwt puede emitir el
+    claim como texto ('1'), y las cachés deben usar la misma clave que
+    `forget_user(instance.pk)`.
+    """
+    return CustomUser._meta.pk.to_python(value)
+
+
+def user_auth_state(user_id):
+    """
+    `(token_version, is_active)` vigentes del usuario, o None si no existe.
+
+    Se busca primero en la caché del proceso (TTL corto), luego en la caché
+    compartida y recién entonces en la base.
+    """
+    user_id = normalize_user_id(user_id)
+    state = _users.get(user_id)
+    if state is None:
+        state = cache.get(user_cache_key(user_id))
+        if state is None:
+            state = (
+                CustomUser.objects.filter(pk=user_id)
+                .values_list("token_version", "is_active")
+                .first()
+            ) or (None, False)
+            cache.set(user_cache_key(user_id), state, auth_shared_ttl())
+        _users.set(user_id, state)
+    return None if state[0] is None else state
+
+
+def forget_user(user_id):
+    """
+    Borra el estado de autenticación en el momento y otra vez al confirmar la
+    transacción: un pedido concurrente que lea la fila anterior al commit no
+    deja la versión vieja guardada en la caché compartida.
+    """
+
+    user_id = normalize_user_id(user_id)
+
+    def forget():
+        # En los demás procesos la copia local vence a los pocos segundos
+        cache.delete(user_cache_key(user_id))
+        _users.pop(user_id)
+
+    forget()
+    transaction.on_commit(forget)
+
+
+def build_user(**values):
+    """Instancia de CustomUser con solo algunos campos cargados; el resto
+    queda diferido y se lee de la base recién si se usa."""
+    fields = CustomUser._meta.concrete_fields
+    return CustomUser.from_db(
+        "default",
+        [field.attname for field in fields],
+        [values.get(field.attname, DEFERRED) for field in fields],
+    )
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Autenticación JWT que confía en los claims firmados (id, username,
+    is_active y versión de tokens) en lugar de leer el usuario en cada
+    pedido. Solo se valida la versión contra `user_auth_state`, de modo que
+    `CustomUser.revoke_tokens()` invalida los tokens emitidos.
+    """
+
+    def get_user(self, validated_token):
+        if "ver" not in validated_token:
+            # Tokens emitidos antes de los claims extendidos
+            return super().get_user(validated_token)
+
+        try:
+            user_id = normalize_user_id(validated_token[api_settings.USER_ID_CLAIM])
+        except ValidationError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        state = user_auth_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        token_version, is_active = state
+        if not (is_active and validated_token.get("is_active")):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if validated_token["ver"] != token_version:
+            raise AuthenticationFailed("Token revocado", code="token_revoked")
+
+        return build_user(
+            **{
+                api_settings.USER_ID_FIELD: user_id,
+                "username": validated_token.get("username"),
+                "is_active": is_active,
+                "token_version": token_version,
+            }
+        )
+
+
+def credentials_key(userid, password):
+    # HMAC con SECRET_KEY: la caché no guarda nada que sirva para recuperar
+    # ni probar contraseñas sin conocer la clave del proyecto
+    message = f"{userid}\0{password}".encode("utf-8")
+    return hmac.new(
+        settings.SECRET_KEY.encode("utf-8"), message, hashlib.sha256
+    ).digest()
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    """
+    Autenticación Basic que recuerda por unos segundos las credenciales ya
+    verificadas, de modo que las llamadas repetidas no vuelven a pagar el
+    hash de la contraseña.
+
+    La entrada guarda el hash de la contraseña vigente al verificarla; si el
+    usuario cambia la contraseña (o se rehashea) deja de coincidir con la
+    fila y se vuelve a verificar completo.
+    """
+
+    def authenticate_credentials(self, userid, password, request=None):
+        key = credentials_key(userid, password)
+        cached = _credentials.get(key)
+        if cached is not None:
+            user_id, encoded = cached
+            user = CustomUser._default_manager.filter(pk=user_id).first()
+            if user is not None and user.is_active and user.password == encoded:
+                return (user, None)
+            _credentials.pop(key)
+
+        user, auth = super().authenticate_credentials(userid, password, request)
+        _credentials.set(key, (user.pk, user.password))
+        return (user, auth)
@@ -0,0 +1,66 @@
+from functools import cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from WorkStream.models import CustomUser
+from WorkStream.ttl_cache import TTLCache
+
+AUTOCOMPLETE_FIELDS = ("username", "full_name", "email")
+
+# Prefijos consultados hace poco (los más cortos se repiten en cada tecla)
+_results = TTLCache(ttl=lambda: getattr(settings, "WORKSTREAM_AUTOCOMPLETE_TTL", 30))
+
+
+@cache
+def trigram_enabled():
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def autocomplete_users(term, limit):
+    """
+    Hasta `limit` usuarios activos cuyo username, nombre o email empiezan
+    con `term` (sin distinguir mayúsculas), primero las coincidencias por
+    username. Con pg_trgm y tres o más caracteres también se aceptan
+    coincidencias en medio del texto, después de las de prefijo.
+
+    Devuelve tuplas `(id, username, full_name, avatar)` y guarda el resultado
+    unos segundos en memoria del proceso.
+    """
+    key = (term.casefold(), limit)
+    rows = _results.get(key)
+    if rows is not None:
+        return rows
+
+    # istartswith usa los índices UPPER(...) text_pattern_ops (migración 0014)
+    rank = Case(
+        *[
+            When(Q(**{f"{field}__istartswith": term}), then=Value(index))
+            for index, field in enumerate(AUTOCOMPLETE_FIELDS)
+        ],
+        default=Value(len(AUTOCOMPLETE_FIELDS)),
+        output_field=IntegerField(),
+    )
+    lookup = "icontains" if trigram_enabled() and len(term) >= 3 else "istartswith"
+    matches = Q()
+    for field in AUTOCOMPLETE_FIELDS:
+        matches |= Q(**{f"{field}__{lookup}": term})
+
+    rows = list(
+        CustomUser.objects.filter(matches, is_active=True)
+        .annotate(rank=rank)
+        .order_by("rank", "username", "id")
+        .values_list("id", "username", "full_name", "avatar")[:limit]
+    )
+    _results.set(key, rows)
+    return rows
+
+
+def forget_autocomplete():
+    # Los demás procesos ven el cambio cuando vence el TTL
+    _results.clear()
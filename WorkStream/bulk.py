@@ -0,0 +1,128 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from WorkStream.cache import invalidate_task_lists
+from WorkStream.comment_stats import comments_added
+from WorkStream.models import Comment, Task
+from WorkStream.permissions import with_owner_or_assignee
+from WorkStream.search import refresh_search_vectors
+from WorkStream.stats import count_tasks
+
+
+def lock_tasks(user, tasks):
+    """
+    Bloquea las tareas pedidas y las separa en editables y prohibidas con una
+    sola consulta; el permiso se evalúa en SQL.
+    """
+    rows = (
+        with_owner_or_assignee(tasks.order_by(), user)
+        .select_for_update()
+        .values_list("pk", "is_owner_or_assignee")
+    )
+    editable, forbidden = [], []
+    for pk, can_edit in rows:
+        (editable if can_edit else forbidden).append(pk)
+    return editable, forbidden
+
+
+def not_found_ids(requested, editable, forbidden):
+    found = set(editable) | set(forbidden)
+    return sorted({pk for pk in requested if pk not in found})
+
+
+def update_tasks(user, tasks, changes, requested_ids=()):
+    with transaction.atomic():
+        editable, forbidden = lock_tasks(user, tasks)
+        if editable:
+            updated = Task.objects.filter(pk__in=editable)
+            # update() no pasa por auto_now ni dispara señales: el resumen de
+            # /tasks/stats/ se corrige restando y volviendo a sumar los grupos
+            count_tasks(updated, -1, assignees=False)
+            updated.update(**changes, updated_at=timezone.now())
+            count_tasks(updated, 1, assignees=False)
+            invalidate_task_lists()
+    return {
+        "updated": sorted(editable),
+        "forbidden": sorted(forbidden),
+        "not_found": not_found_ids(requested_ids, editable, forbidden),
+    }
+
+
+def raw_delete(queryset):
+    # DELETE ... WHERE directo, sin cargar filas ni disparar señales
+    return queryset._raw_delete(queryset.db)
+
+
+def delete_comments(task_ids):
+    """
+    Borra los comentarios de `task_ids` en tandas de
+    WORKSTREAM_BULK_COMMENT_BATCH_SIZE filas por sentencia, así un bloque de
+    tareas con hilos largos no se convierte en un único DELETE enorme.
+    """
+    batch_size = getattr(settings, "WORKSTREAM_BULK_COMMENT_BATCH_SIZE", 5000)
+    batch = Comment.objects.filter(task_id__in=task_ids).order_by("pk").values("pk")
+    total = 0
+    while True:
+        deleted = raw_delete(Comment.objects.filter(pk__in=batch[:batch_size]))
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+def delete_tasks(user, tasks, requested_ids=()):
+    """
+    Borra tareas con DELETE por conjuntos, en bloques de
+    WORKSTREAM_BULK_BATCH_SIZE con una transacción por bloque para no
+    mantener bloqueos largos.
+
+    Se evita el recolector de Django (que carga cada comentario y asignación
+    en memoria antes de borrarlos): primero los comentarios, en tandas
+    acotadas, luego las filas de la tabla intermedia y por último las tareas.
+    """
+    batch_size = getattr(settings, "WORKSTREAM_BULK_BATCH_SIZE", 1000)
+    candidates = list(tasks.order_by("pk").values_list("pk", flat=True))
+    deleted = {"tasks": 0, "comments": 0, "assignments": 0}
+    all_editable, all_forbidden = [], []
+
+    for start in range(0, len(candidates), batch_size):
+        chunk = candidates[start : start + batch_size]
+        with transaction.atomic():
+            editable, forbidden = lock_tasks(user, Task.objects.filter(pk__in=chunk))
+            all_forbidden += forbidden
+            if not editable:
+                continue
+            count_tasks(Task.objects.filter(pk__in=editable), -1)
+            deleted["comments"] += delete_comments(editable)
+            deleted["assignments"] += raw_delete(
+                Task.assigned_users.through.objects.filter(task_id__in=editable)
+            )
+            deleted["tasks"] += raw_delete(Task.objects.filter(pk__in=editable))
+            all_editable += editable
+            invalidate_task_lists()
+
+    return {
+        "deleted": deleted,
+        "forbidden": sorted(all_forbidden),
+        "not_found": not_found_ids(requested_ids, all_editable, all_forbidden),
+    }
+
+
+def create_comments(user, items):
+    """
+    Inserta comentarios ya validados con `bulk_create` y actualiza los
+    contadores de todas sus tareas con un solo UPDATE, en una transacción.
+    """
+    with transaction.atomic():
+        comments = Comment.objects.bulk_create(
+            [Comment(user=user, **item) for item in items],
+            batch_size=getattr(settings, "WORKSTREAM_BULK_BATCH_SIZE", 1000),
+        )
+        # bulk_create no dispara las señales que mantienen los contadores
+        comments_added(comments)
+        refresh_search_vectors(
+            Task.objects.filter(pk__in={comment.task_id for comment in comments})
+        )
+    if comments:
+        invalidate_task_lists()
+    return comments
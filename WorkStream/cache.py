@@ -0,0 +1,225 @@
+import threading
+import time
+from copy import copy
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from WorkStream.models import Priority, State
+
+GENERATION_KEY = "workstream:tasks:generation"
+
+
+def task_cache_timeout():
+    return getattr(settings, "WORKSTREAM_TASK_CACHE_TIMEOUT", 300)
+
+
+def task_cache_stale_timeout():
+    return getattr(settings, "WORKSTREAM_TASK_CACHE_STALE_TIMEOUT", 3600)
+
+
+def reference_cache_ttl():
+    return getattr(settings, "WORKSTREAM_REFERENCE_CACHE_TTL", 60)
+
+
+def shared_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Si la clave se perdió se arranca desde el reloj, así nunca se
+        # reutiliza una versión anterior con entradas todavía guardadas.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """
+    Incrementa una versión compartida en el momento y otra vez al confirmar la
+    transacción: una lectura concurrente que guarde datos previos al commit
+    queda asociada a una versión que ya no se consulta.
+    """
+
+    def bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def task_list_generation():
+    return shared_version(GENERATION_KEY)
+
+
+def invalidate_task_lists():
+    """
+    Invalida todos los listados de tareas cacheados.
+
+    La invalidación es global a propósito, no por estado, prioridad o dueño:
+    cada fila de un listado incluye datos de usuarios, estados, prioridades,
+    asignaciones y comentarios, y las escrituras masivas cambian muchas
+    tareas a la vez. Para invalidar por dimensión habría que conocer los
+    valores anteriores y nuevos de cada tarea tocada en cada uno de esos
+    caminos, y una omisión sirve datos viejos hasta el vencimiento. Con una
+    sola generación cada escritura cuesta un INCR y nunca queda un listado
+    desactualizado; a cambio, con escrituras frecuentes la tasa de aciertos
+    baja.
+    """
+    bump_version(GENERATION_KEY)
+
+
+def normalize_params(params, list_params=()):
+    """
+    Parámetros tal como los lee TaskFilter: el último valor de cada clave, sin
+    cambios. Solo en `list_params`, que se leen como conjunto, `b, a,a` y
+    `a,b` son la misma consulta.
+    """
+    normalized = []
+    for key in sorted(params):
+        value = params[key]
+        if key in list_params:
+            value = ",".join(
+                sorted({item.strip() for item in value.split(",") if item.strip()})
+            )
+        normalized.append((key, value))
+    # Codificado, para que un valor con `&` o `=` no imite otra clave
+    return urlencode(normalized)
+
+
+def task_list_cache_key(request, params, list_params=()):
+    # La URL base forma parte de la clave porque los enlaces next/previous
+    # de la respuesta son absolutos; el formato, porque cambia el ETag.
+    renderer = getattr(request, "accepted_renderer", None)
+    raw = ":".join(
+        [
+            renderer.format if renderer else "",
+            f"{request.build_absolute_uri(request.path)}?"
+            f"{normalize_params(params, list_params)}",
+        ]
+    )
+    digest = md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return f"workstream:tasks:list:{digest}"
+
+
+class TaskListCache:
+    """
+    Caché de respuestas de los listados de tareas.
+
+    Cada entrada guarda los datos paginados y sus validadores (ETag y
+    Last-Modified). La copia vigente se guarda bajo la generación actual; una
+    segunda copia sin generación, con un plazo más largo, sirve de respaldo
+    cuando la base de datos falla.
+    """
+
+    def __init__(self, request, params, list_params=()):
+        self.key = task_list_cache_key(request, params, list_params)
+        self.current_key = f"{self.key}:{task_list_generation()}"
+        self.stale_key = f"{self.key}:stale"
+
+    def get(self):
+        return cache.get(self.current_key)
+
+    def get_stale(self):
+        if not task_cache_stale_timeout():
+            return None
+        return cache.get(self.stale_key)
+
+    def set(self, entry):
+        cache.set(self.current_key, entry, task_cache_timeout())
+        if task_cache_stale_timeout():
+            cache.set(self.stale_key, entry, task_cache_stale_timeout())
+
+
+class ReferenceTableCache:
+    """
+    Copia en memoria de una tabla de referencia pequeña (estados, prioridades).
+
+    Cada proceso guarda las filas por id y por nombre (sin distinguir
+    mayúsculas) junto con la versión con la que las leyó. La versión vive en
+    la caché compartida y se incrementa cuando la tabla cambia, así todos los
+    procesos recargan en la siguiente consulta. Si la caché no es compartida
+    (LocMem), los demás procesos no ven el cambio de versión: la copia se
+    recarga igual cada WORKSTREAM_REFERENCE_CACHE_TTL segundos, y antes de
+    informar que un id o nombre no existe.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.version_key = f"workstream:reference:{model._meta.label_lower}:version"
+        self.lock = threading.Lock()
+        self.version = None
+        self.loaded_at = None
+        self.by_id = {}
+        self.by_name = {}
+
+    def __deepcopy__(self, memo):
+        # Es única por proceso; DRF copia los campos que la referencian
+        return self
+
+    def load(self, force=False):
+        # La versión se lee antes que la tabla: si alguien escribe en el medio
+        # la copia queda con la versión vieja y se recarga en la próxima lectura
+        version = shared_version(self.version_key)
+        if force or self.outdated(version):
+            with self.lock:
+                if force or self.outdated(version):
+                    rows = list(self.model.objects.all())
+                    self.by_id = {row.pk: row for row in rows}
+                    self.by_name = {row.name.casefold(): row for row in rows}
+                    self.version = version
+                    self.loaded_at = time.monotonic()
+        return self
+
+    def outdated(self, version):
+        return (
+            version is None
+            or version != self.version
+            or time.monotonic() - self.loaded_at >= reference_cache_ttl()
+        )
+
+    def get(self, pk):
+        row = self.load().by_id.get(pk)
+        if row is None:
+            # Puede ser una fila creada en otro proceso que esta copia todavía
+            # no ve (caché LocMem): se recarga una vez antes de darla por
+            # inexistente
+            row = self.load(force=True).by_id.get(pk)
+        return copy(row) if row is not None else None
+
+    def ids_for(self, ids, names):
+        """
+        Ids existentes entre `ids` más los de `names`. Un id que no existe se
+        busca también como nombre, por si la fila se llama con un número. Si
+        algún valor no aparece, se recarga la tabla una vez antes de
+        descartarlo.
+        """
+        found, missing = self.load().lookup(ids, names)
+        if missing:
+            found, _ = self.load(force=True).lookup(ids, names)
+        return found
+
+    def lookup(self, ids, names):
+        found, missing = [], False
+        for pk in ids:
+            row = self.by_id.get(pk) or self.by_name.get(str(pk))
+            missing = missing or row is None
+            if row is not None:
+                found.append(row.pk)
+        for name in names:
+            row = self.by_name.get(name.casefold())
+            missing = missing or row is None
+            if row is not None:
+                found.append(row.pk)
+        return found, missing
+
+    def invalidate(self):
+        bump_version(self.version_key)
+
+
+states = ReferenceTableCache(State)
+priorities = ReferenceTableCache(Priority)
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Backends que guardan los datos en memoria de cada proceso
+LOCAL_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+@register()
+def shared_cache_check(app_configs, **kwargs):
+    # Las versiones de los listados de tareas, estados y prioridades y el
+    # estado de autenticación de los usuarios se comparten por la caché
+    backend = settings.CACHES.get("default", {}).get("BACKEND")
+    if settings.DEBUG or backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        Warning(
+            "La caché por defecto no se comparte entre procesos.",
+            hint=(
+                "Con varios workers, los cambios en tareas, estados, prioridades "
+                "y tokens no se ven en los demás procesos hasta que vence cada "
+                "caché local. Configure CACHE_BACKEND (p. ej. Redis o Memcached)."
+            ),
+            id="WorkStream.W001",
+        )
+    ]
@@ -0,0 +1,105 @@
+from django.db.models import (
+    Case,
+    Count,
+    DateTimeField,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from WorkStream.models import Comment, Task
+
+
+def latest_comment_at():
+    return Subquery(
+        Comment.objects.filter(task_id=OuterRef("pk"))
+        .order_by("-created_at", "-id")
+        .values("created_at")[:1]
+    )
+
+
+def comments_count():
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(task_id=OuterRef("pk"))
+            .order_by()
+            .values("task_id")
+            .annotate(total=Count("id"))
+            .values("total")
+        ),
+        0,
+    )
+
+
+def comment_added(task_id, created_at):
+    # Incremento atómico: dos comentarios simultáneos no se pisan
+    created_at = Value(created_at, output_field=DateTimeField())
+    Task.objects.filter(pk=task_id).update(
+        comment_count=F("comment_count") + 1,
+        last_comment_at=Greatest(Coalesce("last_comment_at", created_at), created_at),
+        updated_at=timezone.now(),
+    )
+
+
+def comments_added(comments):
+    """
+    Versión por lotes de `comment_added`: un único UPDATE para todas las
+    tareas afectadas, con el incremento y la fecha de cada una en un CASE.
+    """
+    counts, latest = {}, {}
+    for comment in comments:
+        counts[comment.task_id] = counts.get(comment.task_id, 0) + 1
+        latest[comment.task_id] = max(
+            latest.get(comment.task_id, comment.created_at), comment.created_at
+        )
+    if not counts:
+        return
+    increment = Case(
+        *[When(pk=pk, then=Value(count)) for pk, count in counts.items()],
+        output_field=IntegerField(),
+    )
+    created_at = Case(
+        *[When(pk=pk, then=Value(value)) for pk, value in latest.items()],
+        output_field=DateTimeField(),
+    )
+    Task.objects.filter(pk__in=counts).update(
+        comment_count=F("comment_count") + increment,
+        last_comment_at=Greatest(Coalesce("last_comment_at", created_at), created_at),
+        updated_at=timezone.now(),
+    )
+
+
+def comment_removed(task_id):
+    # El último comentario restante sale del índice (task, created_at, id)
+    Task.objects.filter(pk=task_id).update(
+        comment_count=Greatest(F("comment_count") - 1, 0),
+        last_comment_at=latest_comment_at(),
+        updated_at=timezone.now(),
+    )
+
+
+def refresh_comment_stats(tasks):
+    """
+    Recalcula `comment_count` y `last_comment_at` de las tareas dadas con un
+    único UPDATE, tocando solo las que no coinciden. Devuelve cuántas cambió.
+    """
+    stale = tasks.annotate(
+        real_count=comments_count(), real_last=latest_comment_at()
+    ).filter(
+        ~Q(comment_count=F("real_count"))
+        | Q(last_comment_at__isnull=True, real_last__isnull=False)
+        | Q(last_comment_at__isnull=False, real_last__isnull=True)
+        | Q(last_comment_at__lt=F("real_last"))
+        | Q(last_comment_at__gt=F("real_last"))
+    )
+    return Task.objects.filter(pk__in=stale.values("pk")).update(
+        comment_count=comments_count(),
+        last_comment_at=latest_comment_at(),
+        updated_at=timezone.now(),
+    )
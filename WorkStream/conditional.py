@@ -0,0 +1,54 @@
+from hashlib import md5
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+class TaskValidators:
+    """
+    ETag y Last-Modified de un conjunto de tareas.
+
+    Se calculan con una sola consulta de agregación (última modificación y
+    cantidad de filas), sin cargar ni serializar las tareas. La cantidad
+    detecta borrados y la URL completa distingue página, filtros y campos.
+    """
+
+    def __init__(self, etag, last_modified):
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @classmethod
+    def for_tasks(cls, request, tasks):
+        summary = tasks.aggregate(last_modified=Max("updated_at"), count=Count("id"))
+        last_modified = summary["last_modified"]
+        renderer = getattr(request, "accepted_renderer", None)
+        key = ":".join(
+            [
+                str(summary["count"]),
+                last_modified.isoformat() if last_modified else "",
+                request.get_full_path(),
+                renderer.format if renderer else "",
+            ]
+        )
+        etag = quote_etag(md5(key.encode(), usedforsecurity=False).hexdigest())
+        return cls(etag, last_modified)
+
+    def not_modified(self, request):
+        # If-None-Match tiene prioridad; If-Modified-Since solo se usa sin ETag
+        response = get_conditional_response(
+            request,
+            etag=self.etag,
+            last_modified=(
+                int(self.last_modified.timestamp()) if self.last_modified else None
+            ),
+        )
+        return response and self.apply(response)
+
+    def apply(self, response):
+        if response.status_code in (200, 304):
+            response["ETag"] = self.etag
+            if self.last_modified:
+                response["Last-Modified"] = http_date(self.last_modified.timestamp())
+            patch_vary_headers(response, ["Accept"])
+        return response
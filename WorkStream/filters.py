@@ -0,0 +1,94 @@
+from functools import reduce
+from operator import or_
+
+import django_filters
+from django.db.models import Exists, OuterRef, Q
+
+from WorkStream.cache import priorities, states
+from WorkStream.models import Task
+
+
+def split_values(value):
+    """
+    Separa un parámetro `a,b,c` en ids numéricos y nombres. Un valor numérico
+    se toma como id; quien lo consume decide si vuelve a buscarlo por nombre.
+    """
+    ids, names = [], []
+    for item in value.split(","):
+        item = item.strip()
+        if item.isdigit():
+            ids.append(int(item))
+        elif item:
+            names.append(item)
+    return ids, names
+
+
+def id_or_name_q(rows, field, name_lookup, value):
+    # Los ids se comparan directamente contra la columna de la tarea para que
+    # el planificador use los índices compuestos (columna, deadline, id); los
+    # nombres se resuelven con un JOIN dentro de la misma consulta.
+    ids, names = split_values(value)
+    if ids:
+        # Un valor numérico sin filas con ese id se busca como username
+        # (p. ej. `12345` de 12345@corp.com). Solo cuesta una consulta sobre
+        # el índice de la columna cuando el filtro trae valores numéricos.
+        present = set(
+            rows.filter(**{f"{field}__in": ids})
+            .values_list(field, flat=True)
+            .distinct()
+        )
+        names += [str(pk) for pk in ids if pk not in present]
+        ids = [pk for pk in ids if pk in present]
+    conditions = []
+    if ids:
+        conditions.append(Q(**{f"{field}__in": ids}))
+    if names:
+        conditions.append(Q(**{f"{name_lookup}__in": names}))
+    return reduce(or_, conditions, Q(pk__in=[]))
+
+
+class TaskFilter(django_filters.FilterSet):
+    """
+    Filtros combinables del listado de tareas. `state`, `priority`, `owner` y
+    `assigned_users` aceptan ids o nombres separados por comas. Un valor
+    numérico es un id; si no hay estado o prioridad con ese id, ni tareas con
+    ese dueño o usuario asignado, se busca como nombre.
+    """
+
+    # Filtros que leen una lista separada por comas como conjunto
+    LIST_FILTERS = ("state", "priority", "owner", "assigned_users")
+
+    state = django_filters.CharFilter(method="filter_state")
+    priority = django_filters.CharFilter(method="filter_priority")
+    owner = django_filters.CharFilter(method="filter_owner")
+    assigned_users = django_filters.CharFilter(method="filter_assigned_users")
+    deadline = django_filters.DateFilter(field_name="deadline")
+    deadline_before = django_filters.DateFilter(field_name="deadline", lookup_expr="lt")
+    deadline_after = django_filters.DateFilter(field_name="deadline", lookup_expr="gt")
+
+    class Meta:
+        model = Task
+        fields = []
+
+    def filter_state(self, queryset, name, value):
+        # Los nombres se traducen a ids en memoria: la consulta no necesita JOIN
+        return queryset.filter(state_id__in=states.ids_for(*split_values(value)))
+
+    def filter_priority(self, queryset, name, value):
+        return queryset.filter(priority_id__in=priorities.ids_for(*split_values(value)))
+
+    def filter_owner(self, queryset, name, value):
+        return queryset.filter(
+            id_or_name_q(Task.objects, "owner_id", "owner__username", value)
+        )
+
+    def filter_assigned_users(self, queryset, name, value):
+        # EXISTS sobre la tabla intermedia: no duplica filas al paginar
+        through = Task.assigned_users.through
+        assignments = through.objects.filter(
+            id_or_name_q(
+                through.objects, "customuser_id", "customuser__username", value
+            ),
+            task_id=OuterRef("pk"),
+        )
+        return queryset.filter(Exists(assignments))
@@ -0,0 +1,55 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+
+    django.setup()
+
+
+def hashing_workers():
+    return getattr(settings, "WORKSTREAM_HASHING_WORKERS", None) or os.cpu_count()
+
+
+def hashing_pool():
+    """
+    Pool de procesos, acotado a WORKSTREAM_HASHING_WORKERS, que se crea la
+    primera vez que se usa y se reutiliza entre pedidos.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: no se heredan conexiones abiertas ni hilos del servidor
+            _pool = ProcessPoolExecutor(
+                max_workers=hashing_workers(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "core.settings"),),
+            )
+            atexit.register(_pool.shutdown, cancel_futures=True)
+        return _pool
+
+
+def hash_passwords(passwords):
+    """
+    Hashea las contraseñas en paralelo y devuelve los hashes en el mismo orden.
+    Los lotes chicos se hashean en el propio proceso: arrancar el pool cuesta
+    más que unos pocos hashes.
+    """
+    passwords = list(passwords)
+    minimum = getattr(settings, "WORKSTREAM_HASHING_MIN_BATCH", 8)
+    if len(passwords) < minimum or hashing_workers() < 2:
+        return [make_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (hashing_workers() * 4))
+    return list(hashing_pool().map(make_password, passwords, chunksize=chunksize))
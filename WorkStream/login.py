@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturated(Exception):
+    pass
+
+
+class BoundedExecutor:
+    """
+    ThreadPoolExecutor con cola acotada: si ya hay `max_workers + max_pending`
+    tareas en curso o esperando, `submit` falla en el acto en lugar de encolar.
+    """
+
+    def __init__(self, max_workers, max_pending, thread_name_prefix=""):
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix)
+        self.slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    def submit(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            raise ExecutorSaturated
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def login_executor():
+    # Los hashes PBKDF2 de hashlib liberan el GIL, así que los hilos del pool
+    # verifican contraseñas en paralelo sin bloquear el event loop. Cada hilo
+    # usa su propia conexión a la base.
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = BoundedExecutor(
+                max_workers=getattr(settings, "WORKSTREAM_LOGIN_WORKERS", 4),
+                max_pending=getattr(settings, "WORKSTREAM_LOGIN_MAX_PENDING", 32),
+                thread_name_prefix="login",
+            )
+        return _executor
+
+
+def timed_authenticate(submitted_at, request, credentials):
+    """
+    Se ejecuta en el pool: `authenticate()` de Django completo, con los
+    backends de AUTHENTICATION_BACKENDS y la señal `user_login_failed`.
+    """
+    started = time.perf_counter()
+    close_old_connections()
+    try:
+        user = authenticate(request, **credentials)
+    finally:
+        # Los hilos del pool no pasan por request_finished: se cierran aquí
+        # las conexiones vencidas para no acumular una por hilo
+        close_old_connections()
+    finished = time.perf_counter()
+    return user, started - submitted_at, finished - started
+
+
+async def authenticate_async(request, **credentials):
+    """
+    Ejecuta `authenticate()` en el pool acotado sin bloquear el event loop.
+
+    Devuelve el usuario (o None) y los tiempos de espera en la cola y de
+    autenticación en segundos. Lanza ExecutorSaturated si el pool está lleno.
+    """
+    future = login_executor().submit(
+        timed_authenticate, time.perf_counter(), request, credentials
+    )
+    return await asyncio.wrap_future(future)
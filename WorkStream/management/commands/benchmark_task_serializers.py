@@ -0,0 +1,100 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from WorkStream.models import CustomUser, Priority, State, Task
+from WorkStream.serializers import TaskFastReadSerializer, TaskReadSerializer
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara TaskReadSerializer con TaskFastReadSerializer sobre N tareas "
+        "generadas dentro de una transacción que se descarta al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=10000)
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--assigned", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.populate(options)
+                self.run(options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def populate(self, options):
+        states = [State.objects.create(name=f"bench-state-{i}") for i in range(3)]
+        priorities = [
+            Priority.objects.create(name=f"bench-priority-{i}") for i in range(3)
+        ]
+        users = CustomUser.objects.bulk_create(
+            CustomUser(
+                username=f"bench{i}",
+                email=f"bench{i}@bench.local",
+                full_name=f"Usuario {i}",
+                birth_date=date(1990, 1, 1) + timedelta(days=i),
+            )
+            for i in range(options["users"])
+        )
+        today = date.today()
+        tasks = Task.objects.bulk_create(
+            Task(
+                name=f"Tarea {i}",
+                description="Descripción de prueba",
+                deadline=today + timedelta(days=i % 365),
+                state=states[i % len(states)],
+                priority=priorities[i % len(priorities)],
+                owner=users[i % len(users)],
+            )
+            for i in range(options["tasks"])
+        )
+        Through = Task.assigned_users.through
+        Through.objects.bulk_create(
+            Through(task_id=task.id, customuser_id=users[(i + j) % len(users)].id)
+            for i, task in enumerate(tasks)
+            for j in range(min(options["assigned"], len(users)))
+        )
+
+    def run(self, repeat):
+        tasks = Task.objects.order_by("deadline", "id")
+        renderer = JSONRenderer()
+
+        def standard():
+            queryset = TaskReadSerializer.setup_eager_loading(tasks)
+            return renderer.render(TaskReadSerializer(queryset, many=True).data)
+
+        def fast():
+            serializer = TaskFastReadSerializer()
+            rows = list(serializer.get_queryset(tasks))
+            return renderer.render(serializer.to_representation(rows))
+
+        results = {}
+        for name, func in (("TaskReadSerializer", standard), ("fast path", fast)):
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                output = func()
+                timings.append(time.perf_counter() - start)
+            results[name] = (min(timings), output)
+            self.stdout.write(f"{name:<20} {min(timings) * 1000:10.1f} ms")
+
+        (slow, expected), (quick, output) = results.values()
+        if output != expected:
+            self.stderr.write("La salida del camino rápido no coincide")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{tasks.count()} tareas: {slow / quick:.1f}x más rápido"
+            )
+        )
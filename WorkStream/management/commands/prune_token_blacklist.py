@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from WorkStream.token_blacklist import prune_blacklist
+
+
+class Command(BaseCommand):
+    help = "Elimina de la lista negra los refresh tokens ya vencidos."
+
+    def handle(self, *args, **options):
+        deleted = prune_blacklist()
+        self.stdout.write(f"{deleted} tokens vencidos eliminados")
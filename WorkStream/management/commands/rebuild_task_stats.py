@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from WorkStream.stats import rebuild_summary
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula desde cero la tabla resumen de /tasks/stats/. Necesario al "
+        "activar WORKSTREAM_TASK_STATS_SUMMARY."
+    )
+
+    def handle(self, *args, **options):
+        groups = rebuild_summary()
+        self.stdout.write(f"{groups} grupos recalculados")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from WorkStream.cache import invalidate_task_lists
+from WorkStream.comment_stats import refresh_comment_stats
+from WorkStream.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula comment_count y last_comment_at de las tareas a partir de "
+        "sus comentarios. Solo modifica las tareas desincronizadas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "tasks", nargs="*", type=int, help="Ids de tareas (por defecto, todas)"
+        )
+
+    def handle(self, *args, **options):
+        tasks = Task.objects.all()
+        if options["tasks"]:
+            tasks = tasks.filter(pk__in=options["tasks"])
+        repaired = refresh_comment_stats(tasks)
+        if repaired:
+            invalidate_task_lists()
+        self.stdout.write(f"{repaired} tareas corregidas")
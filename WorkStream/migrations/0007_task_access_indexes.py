@@ -0,0 +1,78 @@
+# Generated by Django 5.0.6 on 2026-10-17 14:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("WorkStream", "0006_alter_customuser_full_name_alter_customuser_username"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["deadline", "id"], name="task_deadline_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["state", "deadline", "id"], name="task_state_deadline_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["priority", "deadline", "id"], name="task_priority_deadline_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["owner", "deadline", "id"], name="task_owner_deadline_idx"
+            ),
+        ),
+        migrations.RunSQL(
+            sql=[
+                'CREATE INDEX "task_assignee_task_idx" ON "WorkStream_task_assigned_users" ("customuser_id", "task_id");',
+                'DROP INDEX "WorkStream_task_assigned_users_customuser_id_905e58f9";',
+            ],
+            reverse_sql=[
+                'CREATE INDEX "WorkStream_task_assigned_users_customuser_id_905e58f9" ON "WorkStream_task_assigned_users" ("customuser_id");',
+                'DROP INDEX "task_assignee_task_idx";',
+            ],
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="owner",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tasks_owned",
+                to=settings.AUTH_USER_MODEL,
+                verbose_name="Dueño tarea",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="priority",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="WorkStream.priority",
+                verbose_name="Prioridad de la tarea",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="state",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="WorkStream.state",
+                verbose_name="Estado de la tarea",
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.6 on 2026-10-17 15:05
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_stats(apps, schema_editor):
+    Comment = apps.get_model("WorkStream", "Comment")
+    Task = apps.get_model("WorkStream", "Task")
+    comments = Comment.objects.filter(task_id=OuterRef("pk")).order_by()
+    Task.objects.filter(pk__in=Comment.objects.values("task_id")).update(
+        comment_count=Coalesce(
+            Subquery(
+                comments.values("task_id").annotate(total=Count("id")).values("total")
+            ),
+            0,
+        ),
+        last_comment_at=Subquery(
+            comments.order_by("-created_at", "-id").values("created_at")[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("WorkStream", "0011_comment_task_created_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="comment_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Cantidad de comentarios"
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="last_comment_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="Último comentario"
+            ),
+        ),
+        migrations.RunPython(backfill_comment_stats, migrations.RunPython.noop),
+    ]
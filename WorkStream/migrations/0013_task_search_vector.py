@@ -0,0 +1,66 @@
+# Generated by Django 5.0.6 on 2026-10-17 15:11
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce, Left
+
+
+def backfill_search_vectors(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Comment = apps.get_model("WorkStream", "Comment")
+    Task = apps.get_model("WorkStream", "Task")
+    config = getattr(settings, "WORKSTREAM_SEARCH_CONFIG", "spanish")
+    # Mismo recorte que WorkStream.search.task_search_vector: PostgreSQL
+    # rechaza un tsvector de más de 1 MB
+    first_comments = (
+        Comment.objects.filter(task_id=OuterRef(OuterRef("pk")))
+        .order_by("created_at", "id")
+        .values("pk")[: getattr(settings, "WORKSTREAM_SEARCH_MAX_COMMENTS", 100)]
+    )
+    comment_chars = getattr(settings, "WORKSTREAM_SEARCH_COMMENT_CHARS", 1000)
+    comments = Subquery(
+        Comment.objects.filter(pk__in=first_comments)
+        .order_by()
+        .values("task_id")
+        .annotate(text=StringAgg(Left("text", comment_chars), delimiter=" "))
+        .values("text")
+    )
+    Task.objects.update(
+        search_vector=SearchVector("name", weight="A", config=config)
+        + SearchVector("description", weight="B", config=config)
+        + SearchVector(
+            Coalesce(comments, Value(""), output_field=TextField()),
+            weight="C",
+            config=config,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("WorkStream", "0012_task_comment_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="task_search_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
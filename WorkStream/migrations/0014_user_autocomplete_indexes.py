@@ -0,0 +1,69 @@
+# Generated by Django 5.0.6 on 2026-10-17 15:14
+
+from django.db import migrations
+
+AUTOCOMPLETE_FIELDS = ("username", "full_name", "email")
+PREFIX_INDEXES = {f"user_{field}_prefix_idx": field for field in AUTOCOMPLETE_FIELDS}
+TRIGRAM_INDEXES = {f"user_{field}_trgm_idx": field for field in AUTOCOMPLETE_FIELDS}
+
+
+def create_prefix_indexes(apps, schema_editor):
+    # Búsquedas por prefijo sin distinguir mayúsculas (istartswith). La clase
+    # de operadores text_pattern_ops solo existe en PostgreSQL; por eso los
+    # índices no están en CustomUser.Meta
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = schema_editor.quote_name(
+        apps.get_model("WorkStream", "CustomUser")._meta.db_table
+    )
+    for name, column in PREFIX_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {schema_editor.quote_name(name)} ON {table} "
+            f"((UPPER({schema_editor.quote_name(column)}::text)) text_pattern_ops)"
+        )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in PREFIX_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(name)}")
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm es opcional: sin la extensión el autocompletado solo usa prefijos
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    table = schema_editor.quote_name(
+        apps.get_model("WorkStream", "CustomUser")._meta.db_table
+    )
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {schema_editor.quote_name(name)} ON {table} "
+            f"USING gin ((UPPER({schema_editor.quote_name(column)}::text)) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(name)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("WorkStream", "0013_task_search_vector"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
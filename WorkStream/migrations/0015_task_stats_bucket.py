@@ -0,0 +1,47 @@
+# Generated by Django 5.0.6 on 2026-10-17 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("WorkStream", "0014_user_autocomplete_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskStatsBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("state_priority", "Estado y prioridad"),
+                            ("owner", "Dueño"),
+                            ("assignee", "Usuario asignado"),
+                            ("deadline", "Fecha límite"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("key", models.CharField(max_length=32)),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="taskstatsbucket",
+            constraint=models.UniqueConstraint(
+                fields=("dimension", "key"), name="task_stats_bucket_unique"
+            ),
+        ),
+    ]
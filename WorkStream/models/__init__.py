@@ -3,3 +3,5 @@ from WorkStream.models.customUser import CustomUser
 from WorkStream.models.priority import Priority
 from WorkStream.models.state import State
 from WorkStream.models.tasks import Task
+from WorkStream.models.token_blacklist import BlacklistedToken
+from WorkStream.models.task_stats import TaskStatsBucket
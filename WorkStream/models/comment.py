@@ -5,7 +5,10 @@ from WorkStream.models.tasks import Task
 
 
 class Comment(models.Model):
-    task = models.ForeignKey(Task, related_name="comments", on_delete=models.CASCADE)
+    # El índice (task, created_at, id) de Meta cubre las búsquedas por tarea
+    task = models.ForeignKey(
+        Task, related_name="comments", on_delete=models.CASCADE, db_index=False
+    )
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -14,5 +17,12 @@ class Comment(models.Model):
     text = models.TextField(blank=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["task", "created_at", "id"], name="comment_task_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return self.text[:20]
@@ -2,6 +2,10 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 
 
+def username_from_email(email):
+    return email.split("@")[0]
+
+
 class CustomUser(AbstractUser):
     username = models.CharField(unique=True, null=True)
     email = models.EmailField(unique=True, verbose_name="Correo electrónico")
@@ -17,6 +21,19 @@ class CustomUser(AbstractUser):
     identification = models.PositiveIntegerField(
         null=True, blank=True, verbose_name="Número de identificación"
     )
+    # Se incrementa para invalidar todos los tokens emitidos al usuario
+    token_version = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Versión de tokens"
+    )
+
+    # Los índices por prefijo y trigramas del autocompletado son solo de
+    # PostgreSQL y los crea la migración 0014 (ver WorkStream.autocomplete)
 
     def __str__(self):
         return self.username
+
+    def revoke_tokens(self):
+        """Invalida en el acto los access y refresh tokens ya emitidos."""
+        self.token_version = models.F("token_version") + 1
+        self.save(update_fields=["token_version"])
+        self.refresh_from_db(fields=["token_version"])
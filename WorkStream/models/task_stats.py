@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class TaskStatsBucket(models.Model):
+    """
+    Contador de tareas por grupo para /tasks/stats/, mantenido de forma
+    incremental cuando WORKSTREAM_TASK_STATS_SUMMARY está activo (ver
+    WorkStream.stats). `key` identifica el grupo dentro de la dimensión:
+    "estado:prioridad", id del dueño, id del asignado o fecha ISO.
+    """
+
+    STATE_PRIORITY = "state_priority"
+    OWNER = "owner"
+    ASSIGNEE = "assignee"
+    DEADLINE = "deadline"
+    DIMENSIONS = [
+        (STATE_PRIORITY, "Estado y prioridad"),
+        (OWNER, "Dueño"),
+        (ASSIGNEE, "Usuario asignado"),
+        (DEADLINE, "Fecha límite"),
+    ]
+
+    dimension = models.CharField(max_length=16, choices=DIMENSIONS)
+    key = models.CharField(max_length=32)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dimension", "key"], name="task_stats_bucket_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension} {self.key}: {self.count}"
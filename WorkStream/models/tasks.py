@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from core import settings
@@ -11,16 +13,24 @@ class Task(models.Model):
     description = models.CharField(
         max_length=255, verbose_name="Descripción de la tarea"
     )
+    # Los índices simples de las FK quedan cubiertos por los índices compuestos
     state = models.ForeignKey(
-        State, on_delete=models.CASCADE, verbose_name="Estado de la tarea"
+        State,
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name="Estado de la tarea",
     )
     priority = models.ForeignKey(
-        Priority, on_delete=models.CASCADE, verbose_name="Prioridad de la tarea"
+        Priority,
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name="Prioridad de la tarea",
     )
     deadline = models.DateField(verbose_name="Fecha de la tarea")
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        db_index=False,
         related_name="tasks_owned",
         verbose_name="Dueño tarea",
     )
@@ -29,6 +39,18 @@ class Task(models.Model):
         related_name="tasks_assigned",
         verbose_name="usuario asignado ",
     )
+    # Marca de cambio para las respuestas condicionales (ETag/Last-Modified)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última modificación")
+    # Resumen de comentarios para las tarjetas, mantenido por señales
+    # (ver WorkStream.comment_stats)
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Cantidad de comentarios"
+    )
+    last_comment_at = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="Último comentario"
+    )
+    # Nombre, descripción y comentarios para /search/ (ver WorkStream.search)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return f"tarea: {self.name} en estado {self.state}"
@@ -38,3 +60,16 @@ class Task(models.Model):
         verbose_name = "Tarea"
         verbose_name_plural = "Tareas"
         ordering = ["deadline"]
+        indexes = [
+            models.Index(fields=["deadline", "id"], name="task_deadline_idx"),
+            models.Index(
+                fields=["state", "deadline", "id"], name="task_state_deadline_idx"
+            ),
+            models.Index(
+                fields=["priority", "deadline", "id"], name="task_priority_deadline_idx"
+            ),
+            models.Index(
+                fields=["owner", "deadline", "id"], name="task_owner_deadline_idx"
+            ),
+            GinIndex(fields=["search_vector"], name="task_search_idx"),
+        ]
@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class BlacklistedToken(models.Model):
+    """
+    Refresh token ya usado o revocado, identificado por su `jti`.
+
+    Solo se guardan los tokens consumidos al rotar (no uno por login) y cada
+    fila deja de importar cuando el token vence, así que la tabla se poda por
+    `expires_at` (ver el comando `prune_token_blacklist`).
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,168 @@
+import json
+from base64 import b64decode, b64encode
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre una clave de ordenamiento única.
+
+    El cursor guarda los valores de `ordering` de la última fila entregada, de
+    modo que cada página es un rango del índice y cuesta lo mismo que la
+    primera, sin OFFSET. Un campo con prefijo "-" se recorre en orden
+    descendente.
+    """
+
+    ordering = ()
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Cursor inválido"
+
+    @classmethod
+    def ordering_fields(cls):
+        return [field.lstrip("-") for field in cls.ordering]
+
+    @property
+    def page_size(self):
+        return getattr(settings, "WORKSTREAM_PAGE_SIZE", 50)
+
+    @property
+    def max_page_size(self):
+        return getattr(settings, "WORKSTREAM_MAX_PAGE_SIZE", 500)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        self.reverse = bool(cursor and cursor["r"])
+        if cursor:
+            try:
+                queryset = queryset.filter(
+                    self.keyset_filter(cursor["p"], self.reverse)
+                )
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # El cursor se arma con las columnas de orden: si el queryset usa only(),
+        # se agregan para no cargarlas luego fila por fila.
+        loaded, deferred = queryset.query.deferred_loading
+        if loaded and not deferred:
+            queryset = queryset.only(*loaded, *self.ordering_fields())
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [
+                field[1:] if field.startswith("-") else f"-{field}"
+                for field in ordering
+            ]
+        results = list(queryset.order_by(*ordering)[: self.limit + 1])
+
+        has_more = len(results) > self.limit
+        self.page = results[: self.limit]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def keyset_filter(self, position, reverse):
+        # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y)
+        fields = self.ordering_fields()
+        conditions = []
+        for index, field in enumerate(fields):
+            descending = self.ordering[index].startswith("-")
+            lookup = "lt" if reverse != descending else "gt"
+            equal = dict(zip(fields[:index], position[:index]))
+            equal[f"{field}__{lookup}"] = position[index]
+            conditions.append(Q(**equal))
+        return reduce(or_, conditions)
+
+    def get_position(self, row):
+        position = []
+        for field in self.ordering_fields():
+            value = row[field] if isinstance(row, dict) else getattr(row, field)
+            position.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return position
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({"p": position, "r": int(reverse)}, separators=(",", ":"))
+        encoded = b64encode(payload.encode("utf-8"), altchars=b"-_").decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(b64decode(encoded.encode("ascii"), altchars=b"-_"))
+            if len(cursor["p"]) != len(self.ordering):
+                raise ValueError
+            cursor["r"] = bool(cursor.get("r"))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+
+class TaskCursorPagination(KeysetPagination):
+    ordering = ("deadline", "id")
+
+
+class CommentCursorPagination(KeysetPagination):
+    ordering = ("created_at", "id")
+
+
+class TaskSearchPagination(KeysetPagination):
+    # `rank` es la anotación de WorkStream.search.search_tasks
+    ordering = ("-rank", "id")
@@ -1,5 +1,25 @@
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
 from rest_framework import permissions
 
+from WorkStream.models import Task
+
+
+def owner_or_assignee_q(user):
+    """Condición SQL equivalente a `IsOwnerOrAssignedUser` para escrituras."""
+    assignments = Task.assigned_users.through.objects.filter(
+        task_id=OuterRef("pk"), customuser_id=user.pk
+    )
+    return Q(owner_id=user.pk) | Q(Exists(assignments))
+
+
+def with_owner_or_assignee(queryset, user):
+    """Agrega `is_owner_or_assignee`, que usa `IsOwnerOrAssignedUser`."""
+    return queryset.annotate(
+        is_owner_or_assignee=ExpressionWrapper(
+            owner_or_assignee_q(user), output_field=BooleanField()
+        )
+    )
+
 
 class IsAuthenticatedOrReadOnly(permissions.BasePermission):
     """
@@ -24,8 +44,17 @@ class IsOwnerOrAssignedUser(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
-        # Write permissions are only allowed to the owner or assigned users
-        return obj.owner == request.user or request.user in obj.assigned_users.all()
+        # Write permissions are only allowed to the owner or assigned users.
+        # Si la tarea viene de `with_owner_or_assignee` no hace falta consultar.
+        allowed = getattr(obj, "is_owner_or_assignee", None)
+        if allowed is not None:
+            return allowed
+        return (
+            obj.owner_id == request.user.pk
+            or Task.assigned_users.through.objects.filter(
+                task_id=obj.pk, customuser_id=request.user.pk
+            ).exists()
+        )
 
 
 class IsCommentOwner(permissions.BasePermission):
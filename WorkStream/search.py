@@ -0,0 +1,150 @@
+import logging
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+)
+from django.db import DatabaseError, connection, transaction
+from django.db.models import (
+    Exists,
+    F,
+    FloatField,
+    Func,
+    OuterRef,
+    Q,
+    Subquery,
+    TextField,
+    Value,
+)
+from django.db.models.functions import Cast, Coalesce, Left
+
+from WorkStream.models import Comment, Task
+
+logger = logging.getLogger(__name__)
+
+
+def search_config():
+    return getattr(settings, "WORKSTREAM_SEARCH_CONFIG", "spanish")
+
+
+def search_max_comments():
+    return getattr(settings, "WORKSTREAM_SEARCH_MAX_COMMENTS", 100)
+
+
+def search_comment_chars():
+    return getattr(settings, "WORKSTREAM_SEARCH_COMMENT_CHARS", 1000)
+
+
+def full_text_enabled():
+    # tsvector y GIN solo existen en PostgreSQL; otros motores usan LIKE
+    return connection.vendor == "postgresql"
+
+
+def task_search_vector():
+    """
+    Documento de búsqueda de una tarea: nombre (peso A), descripción (B) y el
+    texto de sus primeros WORKSTREAM_SEARCH_MAX_COMMENTS comentarios (C),
+    cada uno recortado a WORKSTREAM_SEARCH_COMMENT_CHARS caracteres.
+
+    PostgreSQL rechaza un tsvector de más de 1 MB; con el recorte el documento
+    queda acotado sin importar el largo del hilo ni de cada comentario.
+    """
+    config = search_config()
+    first_comments = (
+        Comment.objects.filter(task_id=OuterRef(OuterRef("pk")))
+        .order_by("created_at", "id")
+        .values("pk")[: search_max_comments()]
+    )
+    comments = Subquery(
+        Comment.objects.filter(pk__in=first_comments)
+        .order_by()
+        .values("task_id")
+        .annotate(
+            text=StringAgg(Left("text", search_comment_chars()), delimiter=" ")
+        )
+        .values("text")
+    )
+    return (
+        SearchVector("name", weight="A", config=config)
+        + SearchVector("description", weight="B", config=config)
+        + SearchVector(
+            Coalesce(comments, Value(""), output_field=TextField()),
+            weight="C",
+            config=config,
+        )
+    )
+
+
+def update_search_vectors(tasks, vector):
+    # update() no pasa por señales ni por auto_now: no cambia updated_at.
+    # El índice es secundario: si PostgreSQL rechaza el documento se conserva
+    # el vector anterior y la escritura que lo disparó sigue adelante.
+    try:
+        with transaction.atomic():
+            tasks.update(search_vector=vector)
+    except DatabaseError:
+        logger.exception("no se pudo actualizar el índice de búsqueda")
+
+
+def refresh_search_vectors(tasks):
+    """Recalcula el documento completo de `tasks`."""
+    if full_text_enabled():
+        update_search_vectors(tasks, task_search_vector())
+
+
+def index_comment(comment):
+    """
+    Agrega un comentario nuevo al documento de su tarea sin volver a leer el
+    hilo. Solo se agrega si está entre los primeros
+    WORKSTREAM_SEARCH_MAX_COMMENTS, igual que en `task_search_vector`; espera
+    `comment_count` ya incrementado.
+    """
+    if not full_text_enabled():
+        return
+    text = SearchVector(
+        Value(comment.text[: search_comment_chars()]),
+        weight="C",
+        config=search_config(),
+    )
+    update_search_vectors(
+        Task.objects.filter(
+            pk=comment.task_id, comment_count__lte=search_max_comments()
+        ),
+        Func(
+            Coalesce(
+                "search_vector", Value("", output_field=SearchVectorField())
+            ),
+            text,
+            template="(%(expressions)s)",
+            arg_joiner=" || ",
+            output_field=SearchVectorField(),
+        ),
+    )
+
+
+def search_tasks(tasks, terms):
+    """
+    Filtra `tasks` por `terms` y anota `rank` (mayor es más relevante).
+
+    En PostgreSQL se usa el índice GIN de `search_vector` con la sintaxis de
+    buscador web (comillas, OR, -palabra); en otros motores, una búsqueda por
+    subcadena sin ranking.
+    """
+    if not full_text_enabled():
+        comments = Comment.objects.filter(task_id=OuterRef("pk"), text__icontains=terms)
+        return tasks.filter(
+            Q(name__icontains=terms)
+            | Q(description__icontains=terms)
+            | Q(Exists(comments))
+        ).annotate(rank=Value(0.0, output_field=FloatField()))
+
+    query = SearchQuery(terms, search_type="websearch", config=search_config())
+    # ts_rank devuelve real; en double precision el valor viaja exacto en el
+    # cursor de paginación
+    return tasks.filter(search_vector=query).annotate(
+        rank=Cast(SearchRank(F("search_vector"), query), FloatField())
+    )
@@ -1,9 +1,23 @@
-from WorkStream.serializers.comment_serializers import CommentSerializer
-from WorkStream.serializers.custom_user_serializers import CustomUserSerializer
+from WorkStream.serializers.comment_serializers import (
+    CommentBatchItemSerializer,
+    CommentSerializer,
+    TaskCommentSerializer,
+)
+from WorkStream.serializers.custom_user_serializers import (
+    CustomUserSerializer,
+    UserAutocompleteSerializer,
+)
 from WorkStream.serializers.login_serializers import LoginSerializer
 from WorkStream.serializers.priority_serializers import PrioritySerializer
 from WorkStream.serializers.state_serializers import StateSerializer
+from WorkStream.serializers.task_bulk_serializers import (
+    TaskBulkUpdateSerializer,
+    TaskTargetSerializer,
+)
 from WorkStream.serializers.task_serializers import (
+    FieldSelection,
     TaskReadSerializer,
     TaskWriteSerializer,
 )
+from WorkStream.serializers.token_serializers import TokenRefreshSerializer
+from WorkStream.serializers.task_fast_serializers import TaskFastReadSerializer
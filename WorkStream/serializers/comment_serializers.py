@@ -2,6 +2,7 @@ from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
 from WorkStream.models import Comment, Task
+from WorkStream.serializers.task_serializers import PreloadedPrimaryKeyRelatedField
 
 CustomUser = get_user_model()
 
@@ -16,3 +17,34 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ["id", "user", "task", "text", "created_at"]
         read_only_fields = ["id", "user", "created_at"]
+
+
+class CommentAuthorSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = CustomUser
+        fields = ["id", "username"]
+
+
+class TaskCommentSerializer(serializers.ModelSerializer):
+    """Comentario dentro del hilo de una tarea, con su autor anidado."""
+
+    user = CommentAuthorSerializer(read_only=True)
+
+    class Meta:
+        model = Comment
+        fields = ["id", "user", "text", "created_at"]
+
+
+class CommentBatchItemSerializer(serializers.ModelSerializer):
+    """
+    Un comentario dentro de un lote. La tarea se valida contra las que la
+    vista precarga en el contexto con una sola consulta.
+    """
+
+    task = PreloadedPrimaryKeyRelatedField(queryset=Task.objects.all())
+
+    class Meta:
+        model = Comment
+        fields = ["id", "task", "text", "created_at"]
+        read_only_fields = ["id", "created_at"]
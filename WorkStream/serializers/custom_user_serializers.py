@@ -1,9 +1,79 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
+
+from WorkStream.autocomplete import forget_autocomplete
+from WorkStream.hashing import hash_passwords
+from WorkStream.models.customUser import username_from_email
 
 CustomUser = get_user_model()
 
 
+class CustomUserBulkSerializer(serializers.ListSerializer):
+    """
+    Alta masiva de usuarios: las contraseñas se hashean en un pool de procesos
+    y los usuarios se insertan con `bulk_create`.
+    """
+
+    def to_internal_value(self, data):
+        # La unicidad se valida para todo el lote con una sola consulta más
+        # abajo, no con un SELECT por usuario
+        for field in self.child.fields.values():
+            field.validators = [
+                validator
+                for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+        attrs = super().to_internal_value(data)
+        # bulk_create no pasa por la señal pre_save: el username se deriva acá
+        usernames = [username_from_email(item["email"]) for item in attrs]
+        emails = [item["email"] for item in attrs]
+        taken_usernames, taken_emails = set(), set()
+        for username, email in CustomUser.objects.filter(
+            Q(username__in=usernames) | Q(email__in=emails)
+        ).values_list("username", "email"):
+            taken_usernames.add(username)
+            taken_emails.add(email)
+        first_email, first_username = {}, {}
+        errors = []
+        for index, (email, username) in enumerate(zip(emails, usernames)):
+            item_errors = {}
+            if email in taken_emails:
+                item_errors["email"] = [
+                    "Ya existe un usuario con este correo electrónico."
+                ]
+            elif first_email.setdefault(email, index) != index:
+                item_errors["email"] = ["Correo electrónico repetido en el lote."]
+            if (
+                username in taken_usernames
+                or first_username.setdefault(username, index) != index
+            ):
+                item_errors["username"] = [f"El usuario {username} ya existe."]
+            errors.append(item_errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        passwords = hash_passwords(item["password"] for item in validated_data)
+        users = []
+        for item, password in zip(validated_data, passwords):
+            user = self.child.build_user(item)
+            user.username = username_from_email(user.email)
+            user.password = password
+            users.append(user)
+        with transaction.atomic():
+            users = CustomUser.objects.bulk_create(
+                users, batch_size=getattr(settings, "WORKSTREAM_BULK_BATCH_SIZE", 1000)
+            )
+            # bulk_create tampoco dispara post_save, que limpia el autocompletado
+            transaction.on_commit(forget_autocomplete)
+        return users
+
+
 class CustomUserSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -19,15 +89,49 @@ class CustomUserSerializer(serializers.ModelSerializer):
             "identification",
         )
         extra_kwargs = {"password": {"write_only": True}}
-    def create(self, validated_data):
+        list_serializer_class = CustomUserBulkSerializer
+
+    @staticmethod
+    def build_user(validated_data):
         # Crear el usuario con todos los campos necesarios
-        user = CustomUser(
+        return CustomUser(
             email=validated_data['email'],
             full_name=validated_data.get('full_name', ''),
             avatar=validated_data.get('avatar', None),
             birth_date=validated_data.get('birth_date', None),
             identification=validated_data.get('identification', None),
         )
+
+    def create(self, validated_data):
+        user = self.build_user(validated_data)
         user.set_password(validated_data['password'])
         user.save()
         return user
+
+
+
+class UserAutocompleteSerializer(serializers.Serializer):
+    """
+    Usuario compacto para los selectores de asignados. Se arma a partir de
+    las tuplas de `WorkStream.autocomplete.autocomplete_users`.
+    """
+
+    id = serializers.IntegerField()
+    username = serializers.CharField()
+    full_name = serializers.CharField(allow_null=True)
+    # No se generan miniaturas: es la URL del avatar original
+    avatar_thumb = serializers.URLField(allow_null=True)
+
+    def to_representation(self, row):
+        user_id, username, full_name, avatar = row
+        if avatar:
+            avatar = CustomUser._meta.get_field("avatar").storage.url(avatar)
+            request = self.context.get("request")
+            if request is not None:
+                avatar = request.build_absolute_uri(avatar)
+        return {
+            "id": user_id,
+            "username": username,
+            "full_name": full_name,
+            "avatar_thumb": avatar or None,
+        }
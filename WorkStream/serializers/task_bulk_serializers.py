@@ -0,0 +1,63 @@
+from rest_framework import serializers
+
+from WorkStream.cache import priorities, states
+from WorkStream.filters import TaskFilter
+from WorkStream.models import Task
+
+from .task_serializers import CachedPrimaryKeyRelatedField
+
+
+class TaskTargetSerializer(serializers.Serializer):
+    """
+    Tareas sobre las que actúa una operación masiva: una lista de `ids` o un
+    `filter` con los mismos parámetros que el listado de tareas.
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False
+    )
+    filter = serializers.DictField(
+        child=serializers.CharField(), required=False, allow_empty=False
+    )
+
+    def validate_filter(self, value):
+        # Un filtro mal escrito no puede terminar afectando a todas las tareas
+        unknown = set(value) - set(TaskFilter.base_filters)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Filtros desconocidos: {', '.join(sorted(unknown))}"
+            )
+        return value
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError("Se debe indicar `ids` o `filter`.")
+        if "ids" in attrs:
+            attrs["tasks"] = Task.objects.filter(pk__in=attrs["ids"])
+        else:
+            filterset = TaskFilter(attrs["filter"], queryset=Task.objects.all())
+            if not filterset.is_valid():
+                raise serializers.ValidationError({"filter": filterset.errors})
+            attrs["tasks"] = filterset.qs
+        return attrs
+
+
+class TaskBulkChangesSerializer(serializers.ModelSerializer):
+
+    state = CachedPrimaryKeyRelatedField(states, required=False)
+    priority = CachedPrimaryKeyRelatedField(priorities, required=False)
+
+    class Meta:
+        model = Task
+        fields = ["state", "priority", "deadline"]
+        extra_kwargs = {"deadline": {"required": False}}
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("No se indicaron cambios.")
+        return attrs
+
+
+class TaskBulkUpdateSerializer(TaskTargetSerializer):
+
+    changes = TaskBulkChangesSerializer()
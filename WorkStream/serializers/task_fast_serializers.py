@@ -0,0 +1,161 @@
+from datetime import date
+
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from WorkStream.models import Task
+from WorkStream.pagination import TaskCursorPagination
+
+from .task_serializers import TaskReadSerializer
+
+
+def fast_converter(field, model_field):
+    """
+    Devuelve una función equivalente a `field.to_representation` para los
+    tipos más comunes, o None cuando el valor de la base ya es la salida.
+    """
+    if isinstance(field, (serializers.IntegerField, serializers.CharField)):
+        return None
+    if isinstance(field, serializers.DateField) and not isinstance(
+        field, serializers.DateTimeField
+    ):
+        if getattr(field, "format", api_settings.DATE_FORMAT).lower() == "iso-8601":
+            return date.isoformat
+    if isinstance(field, serializers.FileField) and getattr(
+        field, "use_url", api_settings.UPLOADED_FILES_USE_URL
+    ):
+        storage = model_field.storage
+        return lambda name: storage.url(name) if name else None
+    return field.to_representation
+
+
+class ObjectLayout:
+    """Cómo armar un objeto anidado a partir de columnas de una fila."""
+
+    __slots__ = ("keys", "sources", "converters")
+
+    def __init__(self, serializer, model):
+        self.keys = []
+        self.sources = []
+        self.converters = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            self.keys.append(name)
+            self.sources.append(field.source)
+            self.converters.append(
+                fast_converter(field, model._meta.get_field(field.source))
+            )
+
+    def build(self, values):
+        return {
+            key: value if convert is None or value is None else convert(value)
+            for key, convert, value in zip(self.keys, self.converters, values)
+        }
+
+
+class TaskFastReadSerializer:
+    """
+    Serializador de solo lectura para listados de tareas.
+
+    Lee filas con `values_list()` en lugar de instancias del modelo, agrupa
+    los usuarios asignados con una única consulta sobre la tabla intermedia y
+    arma los diccionarios directamente. Produce la misma salida que
+    `TaskReadSerializer` (respetando `fields`/`expand`) sin pasar por la
+    maquinaria campo a campo de DRF.
+    """
+
+    def __init__(self, selection=None, pagination_class=TaskCursorPagination):
+        fields = TaskReadSerializer(selection=selection).fields
+        self.columns = []
+        # (clave, tipo, datos): "value" usa un índice y un conversor, "object"
+        # una posición inicial y un ObjectLayout, "many" la tabla de asignados.
+        self.plan = []
+        self.assigned_users = None
+
+        for name, field in fields.items():
+            if isinstance(field, serializers.ListSerializer):
+                self.assigned_users = ObjectLayout(field.child, field.child.Meta.model)
+                self.plan.append((name, "many", None))
+            elif isinstance(field, serializers.ManyRelatedField):
+                self.assigned_users = False
+                self.plan.append((name, "many", None))
+            elif isinstance(field, serializers.BaseSerializer):
+                layout = ObjectLayout(field, field.Meta.model)
+                start = len(self.columns)
+                self.columns += [
+                    f"{field.source}__{source}" for source in layout.sources
+                ]
+                self.plan.append((name, "object", (start, layout)))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                self.plan.append((name, "value", (len(self.columns), None)))
+                self.columns.append(f"{field.source}_id")
+            else:
+                converter = fast_converter(field, Task._meta.get_field(field.source))
+                self.plan.append((name, "value", (len(self.columns), converter)))
+                self.columns.append(field.source)
+
+        # Columnas auxiliares al final de la fila: id para agrupar asignados
+        # y las del orden de paginación para construir el cursor.
+        for column in ("id", *pagination_class.ordering_fields()):
+            if column not in self.columns:
+                self.columns.append(column)
+        self.id_index = self.columns.index("id")
+
+    def get_queryset(self, queryset):
+        return queryset.values_list(*self.columns, named=True)
+
+    def get_assigned_users(self, task_ids):
+        if self.assigned_users is None:
+            return {}
+
+        through = Task.assigned_users.through.objects.filter(task_id__in=task_ids)
+        grouped = {task_id: [] for task_id in task_ids}
+        if self.assigned_users is False:
+            rows = through.order_by("customuser_id").values_list(
+                "task_id", "customuser_id"
+            )
+            for task_id, user_id in rows:
+                grouped[task_id].append(user_id)
+            return grouped
+
+        layout = self.assigned_users
+        rows = through.order_by("customuser_id").values_list(
+            "task_id",
+            "customuser_id",
+            *[f"customuser__{source}" for source in layout.sources],
+        )
+        users = {}
+        for task_id, user_id, *values in rows:
+            user = users.get(user_id)
+            if user is None:
+                user = users[user_id] = layout.build(values)
+            grouped[task_id].append(user)
+        return grouped
+
+    def to_representation(self, rows):
+        assigned = self.get_assigned_users([row[self.id_index] for row in rows])
+        # Los objetos anidados repetidos (estado, dueño...) se arman una sola vez
+        nested = {}
+        data = []
+        for row in rows:
+            task = {}
+            for key, kind, spec in self.plan:
+                if kind == "value":
+                    index, convert = spec
+                    value = row[index]
+                    task[key] = (
+                        value if convert is None or value is None else convert(value)
+                    )
+                elif kind == "object":
+                    start, layout = spec
+                    values = row[start : start + len(layout.keys)]
+                    cache_key = (key, values)
+                    obj = nested.get(cache_key)
+                    if obj is None:
+                        obj = nested[cache_key] = layout.build(values)
+                    task[key] = obj
+                else:
+                    task[key] = assigned.get(row[self.id_index], [])
+            data.append(task)
+        return data
@@ -1,12 +1,72 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
 from rest_framework import serializers
 
-from WorkStream.models import CustomUser, Priority, State, Task
+from WorkStream.cache import invalidate_task_lists, priorities, states
+from WorkStream.models import CustomUser, Task
+from WorkStream.search import refresh_search_vectors
+from WorkStream.stats import count_tasks
 
 from .custom_user_serializers import CustomUserSerializer
 from .priority_serializers import PrioritySerializer
 from .state_serializers import StateSerializer
 
 
+def readable_columns(serializer):
+    """Columnas del modelo que el serializador realmente emite."""
+    return [
+        field.source
+        for field in serializer.fields.values()
+        if not field.write_only and field.source != "*"
+    ]
+
+
+def split_param(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class FieldSelection:
+    """
+    Selección de campos pedida con `?fields=` y `?expand=`.
+
+    `fields=id,name,owner.username` limita los campos de la tarea y, con la
+    notación `relación.campo`, los del objeto anidado. `expand=state,owner`
+    indica qué relaciones se anidan; las demás se devuelven como ids. Sin
+    `expand` se anidan todas, como hasta ahora.
+    """
+
+    def __init__(self, fields=None, expand=None):
+        self.fields = None
+        self.nested = {}
+        if fields is not None:
+            self.fields = set()
+            for name in fields:
+                relation, _, subfield = name.partition(".")
+                self.fields.add(relation)
+                if subfield:
+                    self.nested.setdefault(relation, set()).add(subfield)
+        self.expand = None if expand is None else set(expand)
+
+    @classmethod
+    def from_request(cls, request):
+        params = request.query_params
+        if "fields" not in params and "expand" not in params:
+            return None
+        fields = params.get("fields")
+        expand = params.get("expand")
+        return cls(
+            fields=None if fields is None else split_param(fields),
+            expand=None if expand is None else split_param(expand),
+        )
+
+    def includes(self, name):
+        return self.fields is None or name in self.fields
+
+    def expands(self, name):
+        return self.expand is None or name in self.expand or name in self.nested
+
+
 class TaskReadSerializer(serializers.ModelSerializer):
     state = StateSerializer()
     priority = PrioritySerializer()
@@ -15,22 +75,212 @@ class TaskReadSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = "__all__"
+        exclude = ["search_vector"]
+
+    def __init__(self, *args, selection=None, **kwargs):
+        self.selection = selection
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.selection
+        if selection is None:
+            return fields
+
+        unknown = (selection.fields or set()) - set(fields)
+        unknown |= (selection.expand or set()) - {
+            name
+            for name, field in fields.items()
+            if isinstance(field, serializers.BaseSerializer)
+        }
+        for relation, subfields in selection.nested.items():
+            field = fields.get(relation)
+            nested = getattr(field, "child", field)
+            if not isinstance(nested, serializers.BaseSerializer):
+                unknown.add(relation)
+                continue
+            # Los campos de solo escritura (p. ej. owner.password) no se emiten
+            readable = {
+                name for name, field in nested.fields.items() if not field.write_only
+            }
+            unknown |= {f"{relation}.{name}" for name in subfields - readable}
+            for name in set(nested.fields) - subfields:
+                nested.fields.pop(name)
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": f"Campos desconocidos: {', '.join(sorted(unknown))}"}
+            )
+
+        for name, field in list(fields.items()):
+            if not selection.includes(name):
+                del fields[name]
+            elif isinstance(
+                field, serializers.BaseSerializer
+            ) and not selection.expands(name):
+                fields[name] = serializers.PrimaryKeyRelatedField(
+                    read_only=True, many=isinstance(field, serializers.ListSerializer)
+                )
+        return fields
+
+    @classmethod
+    def setup_eager_loading(cls, queryset=None, selection=None):
+        """
+        Prepara el queryset para serializar tareas con un número constante de
+        consultas: un JOIN para estado, prioridad y dueño y un único prefetch
+        para los usuarios asignados, cargando solo las columnas que se emiten.
+        """
+        if queryset is None:
+            queryset = Task.objects.all()
+
+        fields = cls(selection=selection).fields
+        columns = []
+        related = []
+        for name, field in fields.items():
+            if isinstance(
+                field, (serializers.ListSerializer, serializers.ManyRelatedField)
+            ):
+                continue
+            columns.append(field.source)
+            if isinstance(field, serializers.BaseSerializer):
+                related.append(field.source)
+                columns.extend(
+                    f"{field.source}__{column}" for column in readable_columns(field)
+                )
+        if related:
+            queryset = queryset.select_related(*related)
+        queryset = queryset.only(*columns)
+
+        assigned_users = fields.get("assigned_users")
+        if assigned_users is None:
+            return queryset
+        if isinstance(assigned_users, serializers.ListSerializer):
+            user_columns = readable_columns(assigned_users.child)
+        else:
+            user_columns = ["id"]
+        return queryset.prefetch_related(
+            Prefetch(
+                "assigned_users",
+                queryset=CustomUser.objects.only(*user_columns).order_by("id"),
+            )
+        )
+
+
+class LookupPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """PrimaryKeyRelatedField que resuelve el id con `lookup()`."""
+
+    def lookup(self, pk):
+        return self.get_queryset().filter(pk=pk).first()
+
+    def to_internal_value(self, data):
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            instance = self.lookup(int(data))
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        if instance is None:
+            self.fail("does_not_exist", pk_value=data)
+        return instance
+
+
+class CachedPrimaryKeyRelatedField(LookupPrimaryKeyRelatedField):
+    """Valida el id contra la copia en memoria de una tabla de referencia."""
+
+    def __init__(self, reference, **kwargs):
+        self.reference = reference
+        kwargs.setdefault("queryset", reference.model.objects.all())
+        super().__init__(**kwargs)
+
+    def lookup(self, pk):
+        return self.reference.get(pk)
+
+
+class PreloadedPrimaryKeyRelatedField(LookupPrimaryKeyRelatedField):
+    """
+    Usa las instancias que el serializador de lote precarga en el contexto
+    (`preloaded`, por modelo); fuera de un lote consulta la base.
+    """
+
+    def lookup(self, pk):
+        preloaded = self.context.get("preloaded", {}).get(self.queryset.model)
+        if preloaded is None:
+            return super().lookup(pk)
+        return preloaded.get(pk)
+
+
+def int_values(values):
+    if not isinstance(values, list):
+        return
+    for value in values:
+        try:
+            yield int(value)
+        except (TypeError, ValueError):
+            continue
+
+
+class TaskBulkWriteSerializer(serializers.ListSerializer):
+    """
+    Alta masiva de tareas.
+
+    Valida el lote completo con los usuarios asignados precargados en una sola
+    consulta y lo inserta con `bulk_create` por bloques: un INSERT de tareas y
+    otro de filas de la tabla intermedia por bloque, todo en una transacción.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            user_ids = {
+                pk
+                for item in data
+                if isinstance(item, dict)
+                for pk in int_values(item.get("assigned_users"))
+            }
+            users = CustomUser.objects.filter(pk__in=user_ids).only("id")
+            self.context["preloaded"] = {CustomUser: {user.pk: user for user in users}}
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        owner = self.context["request"].user
+        batch_size = getattr(settings, "WORKSTREAM_BULK_BATCH_SIZE", 1000)
+        Assignment = Task.assigned_users.through
+        created = []
+        with transaction.atomic():
+            for start in range(0, len(validated_data), batch_size):
+                chunk = validated_data[start : start + batch_size]
+                assigned = [item.pop("assigned_users", []) for item in chunk]
+                tasks = Task.objects.bulk_create(
+                    Task(owner=owner, **item) for item in chunk
+                )
+                Assignment.objects.bulk_create(
+                    Assignment(task_id=task.pk, customuser_id=user_id)
+                    for task, users in zip(tasks, assigned)
+                    for user_id in dict.fromkeys(user.pk for user in users)
+                )
+                chunk_tasks = Task.objects.filter(pk__in=[task.pk for task in tasks])
+                refresh_search_vectors(chunk_tasks)
+                count_tasks(chunk_tasks, 1)
+                created += tasks
+        # bulk_create no dispara señales
+        invalidate_task_lists()
+        return created
 
 
 # Serializador para la escritura
 class TaskWriteSerializer(serializers.ModelSerializer):
 
-    state = serializers.PrimaryKeyRelatedField(queryset=State.objects.all())
-    priority = serializers.PrimaryKeyRelatedField(queryset=Priority.objects.all())
-    assigned_users = serializers.PrimaryKeyRelatedField(
+    state = CachedPrimaryKeyRelatedField(states)
+    priority = CachedPrimaryKeyRelatedField(priorities)
+    assigned_users = PreloadedPrimaryKeyRelatedField(
         queryset=CustomUser.objects.all(), many=True
     )
 
     class Meta:
 
         model = Task
-        exclude = ["owner"]
+        exclude = ["owner", "search_vector"]
+        list_serializer_class = TaskBulkWriteSerializer
 
     def create(self, validated_data):
         user = self.context["request"].user
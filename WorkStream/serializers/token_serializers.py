@@ -0,0 +1,51 @@
+from django.core.exceptions import ValidationError
+from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+from WorkStream.authentication import normalize_user_id, user_auth_state
+from WorkStream.token_blacklist import consume, is_blacklisted
+from WorkStream.tokens import WorkStreamRefreshToken
+
+
+class TokenRefreshSerializer(serializers.Serializer):
+    """
+    Emite un access token nuevo a partir de un refresh token. Con
+    `ROTATE_REFRESH_TOKENS` el refresh usado se consume (lista negra por
+    `jti`) y se devuelve otro; reutilizarlo responde 401.
+    """
+
+    refresh = serializers.CharField()
+    access = serializers.CharField(read_only=True)
+
+    def validate(self, attrs):
+        try:
+            refresh = WorkStreamRefreshToken(attrs["refresh"])
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+
+        if "ver" in refresh:
+            try:
+                user_id = normalize_user_id(refresh[api_settings.USER_ID_CLAIM])
+            except ValidationError:
+                raise InvalidToken("Token revocado")
+            state = user_auth_state(user_id)
+            if state is None or not state[1] or refresh["ver"] != state[0]:
+                raise InvalidToken("Token revocado")
+
+        data = {"access": str(refresh.access_token)}
+        if not api_settings.ROTATE_REFRESH_TOKENS:
+            if is_blacklisted(refresh[api_settings.JTI_CLAIM]):
+                raise InvalidToken("Token revocado")
+            return data
+
+        if api_settings.BLACKLIST_AFTER_ROTATION and not consume(
+            refresh[api_settings.JTI_CLAIM], refresh["exp"]
+        ):
+            raise InvalidToken("Token ya utilizado")
+
+        refresh.set_jti()
+        refresh.set_exp()
+        refresh.set_iat()
+        data["refresh"] = str(refresh)
+        return data
@@ -1,9 +1,216 @@
-from django.db.models.signals import pre_save
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
-from WorkStream.models.customUser import CustomUser
+from django.utils import timezone
+
+from WorkStream.authentication import forget_user
+from WorkStream.autocomplete import forget_autocomplete
+from WorkStream.cache import invalidate_task_lists, priorities, states
+from WorkStream.comment_stats import (
+    comment_added,
+    comment_removed,
+    refresh_comment_stats,
+)
+from WorkStream.models.comment import Comment
+from WorkStream.models.customUser import CustomUser, username_from_email
+from WorkStream.models.priority import Priority
+from WorkStream.models.state import State
+from WorkStream.models.tasks import Task
+from WorkStream.search import index_comment, refresh_search_vectors
+from WorkStream.stats import count_assignments, count_tasks
+
+# Campos del usuario que no aparecen en la representación de las tareas
+USER_FIELDS_NOT_IN_TASKS = {"last_login", "password", "token_version"}
+
+# Campos de la tarea que definen sus grupos en /tasks/stats/
+STATS_FIELDS = {
+    "state",
+    "state_id",
+    "priority",
+    "priority_id",
+    "owner",
+    "owner_id",
+    "deadline",
+}
+
 
 @receiver(pre_save, sender=CustomUser)
 def set_username_based_on_email(sender, instance, **kwargs):
     if not instance.username:  # Asegurarse de no sobrescribir usernames existentes
-        username = instance.email.split("@")[0]
-        instance.username = username
+        instance.username = username_from_email(instance.email)
+
+
+def touch_tasks(tasks):
+    # update() no dispara señales ni pasa por auto_now: se marca a mano
+    if tasks.update(updated_at=timezone.now()):
+        invalidate_task_lists()
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=State)
+@receiver(post_delete, sender=Priority)
+def invalidate_task_lists_on_change(sender, **kwargs):
+    invalidate_task_lists()
+
+
+@receiver(post_init, sender=Comment)
+def remember_comment_task(sender, instance, **kwargs):
+    # Se lee de __dict__ para no cargar task_id si quedó diferido
+    instance._loaded_task_id = instance.__dict__.get("task_id")
+
+
+@receiver(post_save, sender=Comment)
+def update_task_on_comment_save(sender, instance, created, **kwargs):
+    tasks = {instance.task_id}
+    if created:
+        comment_added(instance.task_id, instance.created_at)
+        # Un comentario nuevo se agrega al documento sin releer el hilo
+        index_comment(instance)
+    else:
+        if instance._loaded_task_id not in (None, instance.task_id):
+            # El comentario se movió de tarea
+            tasks.add(instance._loaded_task_id)
+            refresh_comment_stats(Task.objects.filter(pk__in=tasks))
+        refresh_search_vectors(Task.objects.filter(pk__in=tasks))
+    instance._loaded_task_id = instance.task_id
+
+
+@receiver(post_delete, sender=Comment)
+def update_task_on_comment_delete(sender, instance, origin=None, **kwargs):
+    # Si se borra la tarea, sus comentarios caen en cascada con ella
+    if isinstance(origin, Task) or getattr(origin, "model", None) is Task:
+        return
+    comment_removed(instance.task_id)
+    refresh_search_vectors(Task.objects.filter(pk=instance.task_id))
+
+
+@receiver(post_save, sender=Task)
+def refresh_search_on_task_save(sender, instance, update_fields, **kwargs):
+    if update_fields and not {"name", "description"} & set(update_fields):
+        return
+    refresh_search_vectors(Task.objects.filter(pk=instance.pk))
+
+
+def stats_fields_changed(update_fields):
+    return not update_fields or bool(STATS_FIELDS & set(update_fields))
+
+
+@receiver(pre_save, sender=Task)
+def uncount_task_before_save(sender, instance, update_fields, **kwargs):
+    # Se restan los grupos que tenía la fila antes de guardarla
+    if not instance._state.adding and stats_fields_changed(update_fields):
+        count_tasks(Task.objects.filter(pk=instance.pk), -1, assignees=False)
+
+
+@receiver(post_save, sender=Task)
+def count_task_after_save(sender, instance, created, update_fields, **kwargs):
+    if created or stats_fields_changed(update_fields):
+        count_tasks(Task.objects.filter(pk=instance.pk), 1, assignees=False)
+
+
+@receiver(pre_delete, sender=Task)
+def uncount_task_on_delete(sender, instance, **kwargs):
+    count_tasks(Task.objects.filter(pk=instance.pk), -1)
+
+
+@receiver(m2m_changed, sender=Task.assigned_users.through)
+def count_assignments_on_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "pre_remove", "pre_clear"):
+        return
+    if action != "pre_clear" and not pk_set:
+        return
+    if reverse:
+        assignments = sender.objects.filter(customuser_id=instance.pk)
+        if action != "pre_clear":
+            assignments = assignments.filter(task_id__in=pk_set)
+    else:
+        assignments = sender.objects.filter(task_id=instance.pk)
+        if action != "pre_clear":
+            assignments = assignments.filter(customuser_id__in=pk_set)
+    count_assignments(assignments, 1 if action == "post_add" else -1)
+
+
+@receiver(m2m_changed, sender=Task.assigned_users.through)
+def touch_tasks_on_assignment(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        touch_tasks(Task.objects.filter(pk=instance.pk))
+    elif action == "pre_clear":
+        touch_tasks(Task.objects.filter(assigned_users=instance))
+    elif pk_set:
+        touch_tasks(Task.objects.filter(pk__in=pk_set))
+
+
+@receiver(post_save, sender=State)
+@receiver(post_save, sender=Priority)
+def touch_tasks_on_catalog_change(sender, instance, created, **kwargs):
+    # Las tareas anidan el estado y la prioridad, así que cambian con ellos
+    if not created:
+        field = "state" if sender is State else "priority"
+        touch_tasks(Task.objects.filter(**{field: instance}))
+
+
+@receiver(post_save, sender=CustomUser)
+def touch_tasks_on_user_change(sender, instance, created, update_fields, **kwargs):
+    if created or (update_fields and set(update_fields) <= USER_FIELDS_NOT_IN_TASKS):
+        return
+    assigned = Task.assigned_users.through.objects.filter(customuser=instance)
+    touch_tasks(
+        Task.objects.filter(Q(owner=instance) | Q(pk__in=assigned.values("task_id")))
+    )
+
+
+@receiver(pre_delete, sender=CustomUser)
+def touch_tasks_on_user_delete(sender, instance, **kwargs):
+    # Borrar al usuario elimina sus asignaciones sin disparar m2m_changed
+    touch_tasks(Task.objects.filter(assigned_users=instance))
+
+
+@receiver(pre_delete, sender=CustomUser)
+def uncount_assignments_on_user_delete(sender, instance, **kwargs):
+    # Las tareas propias se descuentan completas (con sus asignados) al caer
+    # en cascada; aquí solo quedan las asignaciones en tareas de otros
+    count_assignments(
+        Task.assigned_users.through.objects.filter(customuser_id=instance.pk).exclude(
+            task__owner_id=instance.pk
+        ),
+        -1,
+    )
+
+
+@receiver(post_save, sender=State)
+@receiver(post_delete, sender=State)
+def invalidate_states(sender, **kwargs):
+    states.invalidate()
+
+
+@receiver(post_save, sender=Priority)
+@receiver(post_delete, sender=Priority)
+def invalidate_priorities(sender, **kwargs):
+    priorities.invalidate()
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def forget_authenticated_user(sender, instance, **kwargs):
+    # Versión de tokens o estado activo pudieron cambiar
+    forget_user(instance.pk)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_autocomplete(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= USER_FIELDS_NOT_IN_TASKS:
+        return
+    forget_autocomplete()
@@ -0,0 +1,157 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from WorkStream.models import Task, TaskStatsBucket
+
+STATE_PRIORITY = TaskStatsBucket.STATE_PRIORITY
+OWNER = TaskStatsBucket.OWNER
+ASSIGNEE = TaskStatsBucket.ASSIGNEE
+DEADLINE = TaskStatsBucket.DEADLINE
+
+UPSERT_BATCH_SIZE = 1000
+
+
+def summary_enabled():
+    return getattr(settings, "WORKSTREAM_TASK_STATS_SUMMARY", False)
+
+
+def grouped(queryset, *fields):
+    return (
+        queryset.order_by()
+        .values(*fields)
+        .annotate(total=Count("pk"))
+        .values_list(*fields, "total")
+    )
+
+
+def assignment_counts(assignments):
+    return [
+        (ASSIGNEE, str(user_id), total)
+        for user_id, total in grouped(assignments, "customuser_id")
+    ]
+
+
+def group_counts(tasks, assignees=True):
+    """
+    `(dimensión, clave, cantidad)` de las tareas dadas, con un GROUP BY por
+    dimensión.
+    """
+    counts = [
+        (STATE_PRIORITY, f"{state_id}:{priority_id}", total)
+        for state_id, priority_id, total in grouped(tasks, "state_id", "priority_id")
+    ]
+    counts += [
+        (OWNER, str(owner_id), total) for owner_id, total in grouped(tasks, "owner_id")
+    ]
+    counts += [
+        (DEADLINE, deadline.isoformat(), total)
+        for deadline, total in grouped(tasks, "deadline")
+    ]
+    if assignees:
+        counts += assignment_counts(
+            Task.assigned_users.through.objects.filter(
+                task_id__in=tasks.order_by().values("pk")
+            )
+        )
+    return counts
+
+
+def apply_counts(counts, sign=1):
+    """
+    Suma (o resta, con `sign=-1`) las cantidades a la tabla resumen con
+    INSERT ... ON CONFLICT DO UPDATE, sin leer los contadores antes.
+    """
+    merged = {}
+    for dimension, key, total in counts:
+        merged[(dimension, key)] = merged.get((dimension, key), 0) + sign * total
+    # Orden fijo: dos transacciones concurrentes bloquean las filas en el
+    # mismo orden y no se traban entre sí
+    rows = sorted((dimension, key, total) for (dimension, key), total in merged.items())
+
+    quote = connection.ops.quote_name
+    table = quote(TaskStatsBucket._meta.db_table)
+    count = quote("count")
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            chunk = rows[start : start + UPSERT_BATCH_SIZE]
+            cursor.execute(
+                f"INSERT INTO {table} ({quote('dimension')}, {quote('key')}, {count}) "
+                f"VALUES {', '.join(['(%s, %s, %s)'] * len(chunk))} "
+                f"ON CONFLICT ({quote('dimension')}, {quote('key')}) "
+                f"DO UPDATE SET {count} = {table}.{count} + EXCLUDED.{count}",
+                [value for row in chunk for value in row],
+            )
+
+
+def count_tasks(tasks, sign, assignees=True):
+    if summary_enabled():
+        apply_counts(group_counts(tasks, assignees), sign)
+
+
+def count_assignments(assignments, sign):
+    if summary_enabled():
+        apply_counts(assignment_counts(assignments), sign)
+
+
+def rebuild_summary():
+    """Recalcula la tabla resumen completa a partir de las tareas."""
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            # Las escrituras de tareas esperan a que termine la reconstrucción
+            with connection.cursor() as cursor:
+                for model in (Task, Task.assigned_users.through):
+                    cursor.execute(
+                        f"LOCK TABLE {connection.ops.quote_name(model._meta.db_table)} "
+                        "IN SHARE MODE"
+                    )
+        TaskStatsBucket.objects.all().delete()
+        counts = group_counts(Task.objects.all())
+        apply_counts(counts)
+    return len(counts)
+
+
+def stats_from_counts(counts):
+    today = timezone.localdate().isoformat()
+    groups = {dimension: [] for dimension, _ in TaskStatsBucket.DIMENSIONS}
+    for dimension, key, total in counts:
+        if total:
+            groups[dimension].append((key, total))
+
+    by_state_priority = []
+    for key, total in groups[STATE_PRIORITY]:
+        state_id, priority_id = key.split(":")
+        by_state_priority.append(
+            {"state": int(state_id), "priority": int(priority_id), "count": total}
+        )
+    return {
+        "total": sum(total for _, total in groups[STATE_PRIORITY]),
+        "overdue": sum(total for key, total in groups[DEADLINE] if key < today),
+        "by_state_priority": sorted(
+            by_state_priority, key=lambda row: (row["state"], row["priority"])
+        ),
+        "by_owner": sorted(
+            ({"owner": int(key), "count": total} for key, total in groups[OWNER]),
+            key=lambda row: row["owner"],
+        ),
+        "by_assignee": sorted(
+            ({"user": int(key), "count": total} for key, total in groups[ASSIGNEE]),
+            key=lambda row: row["user"],
+        ),
+    }
+
+
+def task_stats(tasks=None):
+    """
+    Estadísticas de `tasks` (por defecto, todas). Sin filtros y con el
+    resumen activo se leen los contadores ya agregados: una consulta que
+    depende de la cantidad de grupos, no de tareas.
+    """
+    if tasks is None and summary_enabled():
+        counts = TaskStatsBucket.objects.filter(count__gt=0).values_list(
+            "dimension", "key", "count"
+        )
+    else:
+        counts = group_counts(Task.objects.all() if tasks is None else tasks)
+    return stats_from_counts(counts)
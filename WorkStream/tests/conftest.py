@@ -1,5 +1,6 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from WorkStream.models import Comment, Task, Priority, State  # Asegúrate de importar los modelos correctos
 
@@ -42,3 +43,10 @@ def api_client(user):
     client = APIClient()
     client.force_authenticate(user=user)
     return client
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # La caché local sobrevive al rollback de cada test
+    cache.clear()
+    yield
+    cache.clear()
@@ -1,9 +1,16 @@
+from io import StringIO
+from unittest import skipUnless
+
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.core.management import call_command
+from django.db import IntegrityError, connection
 from django.test import TestCase
 from django.utils import timezone
 
+from WorkStream.filters import TaskFilter
 from WorkStream.models import Comment, CustomUser, Priority, State, Task
+from WorkStream.pagination import TaskCursorPagination
+from WorkStream.serializers import TaskFastReadSerializer
 
 class StateModelTest(TestCase):
 
@@ -225,6 +232,30 @@ class TaskModelTest(TestCase):
         self.assertEqual(tasks[0], task2)
         self.assertEqual(tasks[1], task1)
 
+    def test_updated_at_follows_related_changes(self):
+        task = Task.objects.create(
+            name="Task",
+            description="Marca de cambio",
+            deadline="2024-06-08",
+            state=self.state,
+            priority=self.priority,
+            owner=self.user,
+        )
+        other = CustomUser.objects.create(username="other", email="other@gmail.com")
+
+        def changes(action):
+            before = Task.objects.get(pk=task.pk).updated_at
+            action()
+            return Task.objects.get(pk=task.pk).updated_at > before
+
+        self.assertTrue(changes(lambda: task.assigned_users.add(other)))
+        self.assertTrue(changes(lambda: other.tasks_assigned.clear()))
+        self.state.name = "Done"
+        self.assertTrue(changes(self.state.save))
+        self.user.full_name = "Administrador"
+        self.assertTrue(changes(self.user.save))
+        self.assertFalse(changes(lambda: self.user.save(update_fields=["last_login"])))
+
 
 class CommentModelTest(TestCase):
 
@@ -298,3 +329,137 @@ class CommentModelTest(TestCase):
         comment.delete()
         with self.assertRaises(Comment.DoesNotExist):
             Comment.objects.get(id=comment_id)
+
+    def stats(self, task=None):
+        task = Task.objects.get(pk=(task or self.task).pk)
+        return task.comment_count, task.last_comment_at
+
+    def test_comment_stats_follow_comments(self):
+        self.assertEqual(self.stats(), (0, None))
+        first = Comment.objects.create(user=self.user, task=self.task, text="uno")
+        second = Comment.objects.create(user=self.user, task=self.task, text="dos")
+        self.assertEqual(self.stats(), (2, second.created_at))
+
+        second.delete()
+        self.assertEqual(self.stats(), (1, first.created_at))
+        first.delete()
+        self.assertEqual(self.stats(), (0, None))
+
+    def test_comment_stats_follow_moved_comment(self):
+        other = Task.objects.create(
+            state=self.task.state,
+            priority=self.task.priority,
+            owner=self.user,
+            name="Tarea 2",
+            description="Descripción de la tarea 2",
+            deadline="2024-06-24",
+        )
+        comment = Comment.objects.create(user=self.user, task=self.task, text="uno")
+        comment.task = other
+        comment.save()
+        self.assertEqual(self.stats(), (0, None))
+        self.assertEqual(self.stats(other), (1, comment.created_at))
+
+    def test_repair_comment_stats(self):
+        comment = Comment.objects.create(user=self.user, task=self.task, text="uno")
+        Task.objects.filter(pk=self.task.pk).update(comment_count=7)
+        out = StringIO()
+        call_command("repair_comment_stats", stdout=out)
+        self.assertEqual(out.getvalue().strip(), "1 tareas corregidas")
+        self.assertEqual(self.stats(), (1, comment.created_at))
+
+        out = StringIO()
+        call_command("repair_comment_stats", stdout=out)
+        self.assertEqual(out.getvalue().strip(), "0 tareas corregidas")
+
+
+@skipUnless(
+    connection.vendor == "postgresql", "EXPLAIN depende del planificador de PostgreSQL"
+)
+class TaskIndexPlanTest(TestCase):
+    """Verifica con EXPLAIN que los listados filtrados usan los índices compuestos."""
+
+    TASKS = 1_000_000
+
+    @classmethod
+    def setUpTestData(cls):
+        task_table = Task._meta.db_table
+        assigned_table = Task.assigned_users.through._meta.db_table
+        cls.state = State.objects.bulk_create(
+            [State(name=f"estado {i}") for i in range(20)]
+        )[3]
+        cls.priority = Priority.objects.bulk_create(
+            [Priority(name=f"prioridad {i}") for i in range(5)]
+        )[1]
+        cls.user = CustomUser.objects.bulk_create(
+            [
+                CustomUser(username=f"usuario{i}", email=f"usuario{i}@gmail.com")
+                for i in range(1000)
+            ]
+        )[5]
+        with connection.cursor() as cursor:
+            # Las FK se validan al insertar y no en cada teardown de la clase
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            cursor.execute(
+                f"""
+                INSERT INTO "{task_table}"
+                    (name, description, state_id, priority_id, deadline, owner_id,
+                    updated_at, comment_count)
+                SELECT 'Tarea ' || g, 'Descripción',
+                    (SELECT MIN(id) FROM "{State._meta.db_table}") + g %% 20,
+                    (SELECT MIN(id) FROM "{Priority._meta.db_table}") + g %% 5,
+                    DATE '2020-01-01' + g %% 2000,
+                    (SELECT MIN(id) FROM "{CustomUser._meta.db_table}") + g %% 1000,
+                    NOW(), 0
+                FROM generate_series(1, %s) AS g
+                """,
+                [cls.TASKS],
+            )
+            # Con estadísticas al día, la verificación de la FK de cada
+            # asignación busca la tarea por índice y no recorre la tabla
+            cursor.execute(f'ANALYZE "{task_table}"')
+            cursor.execute(f"""
+                INSERT INTO "{assigned_table}" (task_id, customuser_id)
+                SELECT id, owner_id FROM "{task_table}"
+                """)
+            cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+            cursor.execute(f'ANALYZE "{task_table}", "{assigned_table}"')
+
+    def plan(self, params, cursor=None):
+        # La misma consulta values_list() que arma el listado con el camino rápido
+        tasks = TaskFilter(params, queryset=Task.objects.all()).qs
+        if cursor:
+            tasks = tasks.filter(TaskCursorPagination().keyset_filter(cursor, False))
+        tasks = TaskFastReadSerializer().get_queryset(tasks)
+        return tasks.order_by(*TaskCursorPagination.ordering)[:51].explain()
+
+    def assertUsesIndex(self, plan, index):
+        self.assertIn(index, plan)
+        self.assertNotIn(f'Seq Scan on "{Task._meta.db_table}"', plan)
+
+    def test_unfiltered_list(self):
+        self.assertUsesIndex(self.plan({}), "task_deadline_idx")
+
+    def test_filter_by_state(self):
+        self.assertUsesIndex(
+            self.plan({"state": str(self.state.id)}), "task_state_deadline_idx"
+        )
+
+    def test_filter_by_priority(self):
+        self.assertUsesIndex(
+            self.plan({"priority": str(self.priority.id)}), "task_priority_deadline_idx"
+        )
+
+    def test_filter_by_owner(self):
+        self.assertUsesIndex(
+            self.plan({"owner": str(self.user.id)}), "task_owner_deadline_idx"
+        )
+
+    def test_filter_by_assigned_user(self):
+        self.assertUsesIndex(
+            self.plan({"assigned_users": str(self.user.id)}), "task_assignee_task_idx"
+        )
+
+    def test_later_page_by_state(self):
+        plan = self.plan({"state": str(self.state.id)}, cursor=["2024-06-01", 500000])
+        self.assertUsesIndex(plan, "task_state_deadline_idx")
@@ -1,14 +1,18 @@
 from datetime import datetime
 
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIRequestFactory, APITestCase
 
 from WorkStream.models import Comment, CustomUser, Priority, State, Task
 from WorkStream.serializers import (
     CommentSerializer,
     CustomUserSerializer,
+    FieldSelection,
     LoginSerializer,
     PrioritySerializer,
     StateSerializer,
+    TaskFastReadSerializer,
     TaskReadSerializer,
     TaskWriteSerializer,
 )
@@ -186,6 +190,46 @@ class CustomUserSerializerTest(APITestCase):
             user.username, self.user.username
         )  # Ensure other fields are unchanged
 
+    @override_settings(WORKSTREAM_HASHING_WORKERS=2)
+    def test_bulk_creation_hashes_in_pool(self):
+        data = [
+            {"email": f"empleado{i}@example.com", "password": f"clave{i}"}
+            for i in range(10)
+        ]
+        serializer = CustomUserSerializer(data=data, many=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.assertNumQueries(3):
+            # SAVEPOINT, un único INSERT y RELEASE
+            users = serializer.save()
+        self.assertEqual(
+            [user.username for user in users][:2], ["empleado0", "empleado1"]
+        )
+        stored = CustomUser.objects.get(username="empleado7")
+        self.assertTrue(stored.check_password("clave7"))
+
+    def test_bulk_validation_checks_uniqueness_in_one_query(self):
+        data = [
+            {"email": f"empleado{i}@example.com", "password": f"clave{i}"}
+            for i in range(50)
+        ]
+        serializer = CustomUserSerializer(data=data, many=True)
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_bulk_creation_rejects_duplicates(self):
+        data = [
+            {"email": "nuevo@example.com", "password": "clave"},
+            {"email": "nuevo@example.com", "password": "clave"},
+            {"email": "user_test@otro.com", "password": "clave"},
+            {"email": "user_test@example.com", "password": "clave"},
+        ]
+        serializer = CustomUserSerializer(data=data, many=True)
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors[0], {})
+        self.assertIn("email", serializer.errors[1])
+        self.assertIn("username", serializer.errors[2])
+        self.assertIn("email", serializer.errors[3])
+
 
 class TaskSerializerTest(APITestCase):
 
@@ -350,4 +394,67 @@ class CommentSerializerTest(APITestCase):
         serializer = CommentSerializer(self.comment, data=partial_data, partial=True, context={"request":request})
         self.assertTrue(serializer.is_valid(), serializer.errors)
         comment = serializer.save()
-        self.assertEqual(comment.text, partial_data["text"])
\ No newline at end of file
+        self.assertEqual(comment.text, partial_data["text"])
+
+
+class TaskFastReadSerializerTest(APITestCase):
+
+    def setUp(self):
+        state = State.objects.create(name="Doing")
+        priority = Priority.objects.create(name="Alta")
+        self.user = CustomUser.objects.create_user(
+            username="user_test",
+            email="user_test@gmail.com",
+            password="password",
+            full_name="Usuario Ñandú",
+            avatar="avatars/foto.png",
+            birth_date="1990-01-01",
+            identification=1234,
+        )
+        self.another_user = CustomUser.objects.create_user(
+            username="anotheruser", email="anotheruser@gmail.com", password="password"
+        )
+        for i in range(3):
+            task = Task.objects.create(
+                name=f"Tarea {i}",
+                description="Descripción con acentos",
+                deadline=f"2024-06-0{i + 1}",
+                state=state,
+                priority=priority,
+                owner=self.user if i % 2 else self.another_user,
+            )
+            task.assigned_users.set([self.another_user, self.user][: i + 1])
+
+    def render_both(self, selection=None):
+        tasks = Task.objects.order_by("deadline", "id")
+        expected = TaskReadSerializer(
+            TaskReadSerializer.setup_eager_loading(tasks, selection),
+            many=True,
+            selection=selection,
+        ).data
+        fast = TaskFastReadSerializer(selection)
+        rows = list(fast.get_queryset(tasks))
+        return JSONRenderer().render(expected), JSONRenderer().render(
+            fast.to_representation(rows)
+        )
+
+    def test_output_is_byte_identical(self):
+        expected, fast = self.render_both()
+        self.assertEqual(fast, expected)
+
+    def test_output_with_selection_is_byte_identical(self):
+        selections = [
+            FieldSelection(expand=[]),
+            FieldSelection(expand=["owner", "assigned_users"]),
+            FieldSelection(fields=["id", "deadline", "owner.avatar", "state"]),
+            FieldSelection(fields=["name"], expand=[]),
+        ]
+        for selection in selections:
+            with self.subTest(fields=selection.fields, expand=selection.expand):
+                expected, fast = self.render_both(selection)
+                self.assertEqual(fast, expected)
+
+    def test_constant_query_count(self):
+        fast = TaskFastReadSerializer()
+        with self.assertNumQueries(2):
+            fast.to_representation(list(fast.get_queryset(Task.objects.all())))
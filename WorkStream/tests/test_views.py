@@ -1,11 +1,49 @@
+import base64
+import json
+import threading
+from datetime import timedelta
+from unittest import mock, skipUnless
+
 import pytest
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.contrib.auth.signals import user_login_failed
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.db.models import Q
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings
 
-from WorkStream.models import Comment, CustomUser, Priority, State, Task
+from WorkStream.authentication import _credentials, build_user, user_cache_key
+from WorkStream.autocomplete import forget_autocomplete
+from WorkStream.cache import invalidate_task_lists, priorities, states
+from WorkStream.checks import shared_cache_check
+from WorkStream.login import BoundedExecutor
+from WorkStream.models import (
+    BlacklistedToken,
+    Comment,
+    CustomUser,
+    Priority,
+    State,
+    Task,
+    TaskStatsBucket,
+)
+from WorkStream.permissions import IsOwnerOrAssignedUser
+from WorkStream.serializers import (
+    CustomUserSerializer,
+    TaskReadSerializer,
+    TaskWriteSerializer,
+)
+from WorkStream.stats import task_stats
+from WorkStream.token_blacklist import prune_blacklist
+from WorkStream.tokens import WorkStreamRefreshToken
 
 
 class ViewSetTests(TestCase):
@@ -161,7 +199,9 @@ def test_delete_comment_unauthorized(api_client, user, another_user, task):
     assert Comment.objects.count() == 1
 
 
-class AuthViewsTest(TestCase):
+class AuthViewsTest(TransactionTestCase):
+    # El login autentica desde los hilos del pool, con otra conexión: los
+    # datos del test tienen que estar confirmados
 
     def setUp(self):
         self.client = APIClient()
@@ -210,6 +250,1604 @@ class AuthViewsTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Verifica que el token de acceso esté en la respuesta
         self.assertIn("access", response.data)
+        self.assertIn("auth;dur=", response["Server-Timing"])
+
+    def test_login_wrong_password(self):
+        CustomUser.objects.create_user(
+            username="test", password="password1234", email="test@gmail.com"
+        )
+        for username in ("test", "inexistente"):
+            response = self.client.post(
+                self.login_url,
+                {"password": "otra", "username": username},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("non_field_errors", response.data)
+
+    def test_login_failure_sends_signal(self):
+        received = []
+
+        def receiver(sender, credentials, **kwargs):
+            received.append(credentials["username"])
+
+        user_login_failed.connect(receiver)
+        try:
+            self.client.post(
+                self.login_url,
+                {"password": "otra", "username": "inexistente"},
+                format="json",
+            )
+        finally:
+            user_login_failed.disconnect(receiver)
+        self.assertEqual(received, ["inexistente"])
+
+    @override_settings(
+        AUTHENTICATION_BACKENDS=["django.contrib.auth.backends.AllowAllUsersModelBackend"]
+    )
+    def test_login_uses_authentication_backends(self):
+        CustomUser.objects.create_user(
+            username="test",
+            password="password1234",
+            email="test@gmail.com",
+            is_active=False,
+        )
+        response = self.client.post(
+            self.login_url,
+            {"password": "password1234", "username": "test"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_login_in_schema(self):
+        response = self.client.get(
+            reverse("schema-json", kwargs={"format": ".json"})
+        )
+        operation = response.json()["paths"]["/login/"]["post"]
+        self.assertIn("200", operation["responses"])
+
+    def test_login_rejected_when_pool_is_saturated(self):
+        executor = BoundedExecutor(max_workers=1, max_pending=0)
+        release = threading.Event()
+        executor.submit(release.wait)
+        try:
+            with mock.patch("WorkStream.login.login_executor", return_value=executor):
+                response = self.client.post(
+                    self.login_url,
+                    {"password": "password1234", "username": "test"},
+                    format="json",
+                )
+        finally:
+            release.set()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "1")
 
     def tearDown(self):
         CustomUser.objects.all().delete()
+
+
+class TaskReadQueryTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.state = State.objects.create(name="pendiente")
+        self.priority = Priority.objects.create(name="urgente")
+
+    def create_tasks(self, amount):
+        start = Task.objects.count()
+        for i in range(start, start + amount):
+            assignee = CustomUser.objects.create_user(
+                username=f"asignado{i}", password="1234", email=f"asignado{i}@gmail.com"
+            )
+            task = Task.objects.create(
+                name=f"Tarea {i}",
+                description="Descripción",
+                state=self.state,
+                priority=self.priority,
+                deadline="2024-12-31",
+                owner=self.user,
+            )
+            task.assigned_users.set([self.user, assignee])
+
+    def test_task_list_query_count_is_constant(self):
+        # La agregación del ETag, una consulta para las tareas (con JOINs) y
+        # otra para los asignados
+        self.create_tasks(3)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("task-list-create"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # El filtro por estado usa la copia en memoria de la tabla de estados
+        self.create_tasks(5)
+        states.load()
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                reverse("task-by-state-list"), {"state": self.state.id}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_task_list_payload(self):
+        self.create_tasks(1)
+        response = self.client.get(reverse("task-list-create"))
+        task = response.data["results"][0]
+        self.assertEqual(task["state"], {"id": self.state.id, "name": "pendiente"})
+        self.assertEqual(task["owner"]["username"], "usuario")
+        self.assertNotIn("password", task["owner"])
+        self.assertEqual(len(task["assigned_users"]), 2)
+
+    def test_task_detail_query_count(self):
+        self.create_tasks(1)
+        task = Task.objects.get()
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("task-detail", args=[task.id]))
+        self.assertEqual(response.data["name"], task.name)
+
+
+class TaskPaginationTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        state = State.objects.create(name="pendiente")
+        priority = Priority.objects.create(name="urgente")
+        # Varias tareas comparten fecha para probar el desempate por id
+        deadlines = [
+            "2024-01-01",
+            "2024-01-01",
+            "2024-01-01",
+            "2024-02-01",
+            "2024-03-01",
+        ]
+        self.tasks = [
+            Task.objects.create(
+                name=f"Tarea {i}",
+                description="Descripción",
+                state=state,
+                priority=priority,
+                deadline=deadline,
+                owner=self.user,
+            )
+            for i, deadline in enumerate(deadlines)
+        ]
+
+    def test_walk_pages_forward_and_back(self):
+        url = reverse("task-list-create")
+        response = self.client.get(url, {"page_size": 2})
+        self.assertIsNone(response.data["previous"])
+
+        seen = [task["id"] for task in response.data["results"]]
+        pages = [seen]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            pages.append([task["id"] for task in response.data["results"]])
+            seen += pages[-1]
+        self.assertEqual(seen, [task.id for task in self.tasks])
+        self.assertEqual(len(pages), 3)
+
+        response = self.client.get(response.data["previous"])
+        self.assertEqual([task["id"] for task in response.data["results"]], pages[1])
+        self.assertIsNotNone(response.data["next"])
+
+    def test_page_size_is_capped(self):
+        with self.settings(WORKSTREAM_MAX_PAGE_SIZE=3):
+            response = self.client.get(reverse("task-list-create"), {"page_size": 100})
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("task-list-create"), {"cursor": "basura"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskExportTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        state = State.objects.create(name="pendiente")
+        priority = Priority.objects.create(name="urgente")
+        for i in range(3):
+            task = Task.objects.create(
+                name=f"Tarea {i}",
+                description="Descripción",
+                state=state,
+                priority=priority,
+                deadline=f"2024-0{i + 1}-01",
+                owner=self.user,
+            )
+            task.assigned_users.set([self.user])
+
+    def export(self, **params):
+        response = self.client.get(reverse("task-export"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_export_json_matches_serializer(self):
+        response, body = self.export()
+        self.assertEqual(response["Content-Type"], "application/json")
+        expected = TaskReadSerializer(Task.objects.order_by("deadline"), many=True).data
+        self.assertEqual(json.loads(body), json.loads(json.dumps(expected)))
+
+    def test_export_jsonl(self):
+        response, body = self.export(output="jsonl")
+        lines = body.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])["name"], "Tarea 0")
+
+    def test_export_empty_table(self):
+        Task.objects.all().delete()
+        _, body = self.export()
+        self.assertEqual(json.loads(body), [])
+
+    async def test_export_streams_asynchronously_under_asgi(self):
+        response = await self.async_client.get(
+            reverse("task-export"), {"output": "jsonl"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Un iterador síncrono obligaría a Django a armar la respuesta entera
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.decode().splitlines()), 3)
+
+    def test_export_unknown_format(self):
+        response = self.client.get(reverse("task-export"), {"output": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskFilterTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("task-list-create")
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.other = CustomUser.objects.create_user(
+            username="otro", password="1234", email="otro@gmail.com"
+        )
+        self.open = State.objects.create(name="Open")
+        self.done = State.objects.create(name="Done")
+        self.high = Priority.objects.create(name="Alta")
+        self.low = Priority.objects.create(name="Baja")
+        self.first = self.create_task(self.open, self.high, self.user, "2024-01-10")
+        self.second = self.create_task(self.open, self.low, self.other, "2024-02-10")
+        self.third = self.create_task(self.done, self.high, self.user, "2024-03-10")
+        self.first.assigned_users.set([self.user, self.other])
+        self.third.assigned_users.set([self.other])
+
+    def create_task(self, state, priority, owner, deadline):
+        return Task.objects.create(
+            name="Tarea",
+            description="Descripción",
+            state=state,
+            priority=priority,
+            deadline=deadline,
+            owner=owner,
+        )
+
+    def ids(self, url, params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [task["id"] for task in response.data["results"]]
+
+    def test_combined_filters(self):
+        params = {"state": "open", "priority": self.high.id, "owner": "usuario"}
+        self.assertEqual(self.ids(self.url, params), [self.first.id])
+
+    def test_multiple_values(self):
+        params = {"state": f"{self.done.id},open", "owner": self.user.id}
+        self.assertEqual(self.ids(self.url, params), [self.first.id, self.third.id])
+
+    def test_assigned_users_does_not_duplicate(self):
+        params = {"assigned_users": f"usuario,{self.other.id}"}
+        self.assertEqual(self.ids(self.url, params), [self.first.id, self.third.id])
+
+    def test_deadline_range(self):
+        params = {"deadline_after": "2024-01-10", "deadline_before": "2024-03-10"}
+        self.assertEqual(self.ids(self.url, params), [self.second.id])
+
+    def test_invalid_deadline(self):
+        response = self.client.get(self.url, {"deadline": "no-es-fecha"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_numeric_names(self):
+        numeric = State.objects.create(name="2024")
+        user = CustomUser.objects.create_user(
+            username="12345", password="1234", email="12345@corp.com"
+        )
+        task = self.create_task(numeric, self.low, user, "2024-04-10")
+        task.assigned_users.set([user])
+        for params in ({"state": "2024"}, {"owner": "12345"}, {"assigned_users": "12345"}):
+            self.assertEqual(self.ids(self.url, params), [task.id])
+        # Un id con tareas tiene prioridad sobre el nombre
+        self.assertEqual(
+            self.ids(self.url, {"state": str(self.done.id)}), [self.third.id]
+        )
+
+    def test_unknown_state_returns_empty_list(self):
+        self.assertEqual(self.ids(self.url, {"state": "Inexistente"}), [])
+
+    def test_legacy_endpoints(self):
+        self.assertEqual(
+            self.ids(reverse("task-by-priority-list"), {"priority": "baja"}),
+            [self.second.id],
+        )
+        self.assertEqual(
+            self.ids(
+                reverse("task-by-deadline-list"),
+                {"deadline": "2024-02-10", "filter": "before"},
+            ),
+            [self.first.id],
+        )
+        self.assertEqual(
+            self.ids(
+                reverse("task-by-assigned-users-list"), {"assigned_users": "otro"}
+            ),
+            [self.first.id, self.third.id],
+        )
+
+
+class TaskFieldSelectionTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("task-list-create")
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.state = State.objects.create(name="pendiente")
+        self.priority = Priority.objects.create(name="urgente")
+        self.task = Task.objects.create(
+            name="Tarea",
+            description="Descripción",
+            state=self.state,
+            priority=self.priority,
+            deadline="2024-12-31",
+            owner=self.user,
+        )
+        self.task.assigned_users.set([self.user])
+
+    def first_result(self, params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data["results"][0]
+
+    def test_top_level_fields(self):
+        task = self.first_result({"fields": "id,name"})
+        self.assertEqual(task, {"id": self.task.id, "name": "Tarea"})
+
+    def test_expand_renders_other_relations_as_ids(self):
+        task = self.first_result({"expand": "state"})
+        self.assertEqual(task["state"], {"id": self.state.id, "name": "pendiente"})
+        self.assertEqual(task["priority"], self.priority.id)
+        self.assertEqual(task["owner"], self.user.id)
+        self.assertEqual(task["assigned_users"], [self.user.id])
+
+    def test_nested_fields(self):
+        task = self.first_result({"fields": "id,owner.username,assigned_users.id"})
+        self.assertEqual(
+            task,
+            {
+                "id": self.task.id,
+                "owner": {"username": "usuario"},
+                "assigned_users": [{"id": self.user.id}],
+            },
+        )
+
+    def test_unused_columns_are_not_fetched(self):
+        Task.objects.create(
+            name="Otra",
+            description="Descripción",
+            state=self.state,
+            priority=self.priority,
+            deadline="2025-01-31",
+            owner=self.user,
+        )
+        params = {
+            "fields": "id,name,owner,assigned_users",
+            "expand": "",
+            "page_size": 1,
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+        self.assertIsNotNone(response.data["next"])
+        # La primera consulta es la agregación del ETag
+        self.assertEqual(len(queries), 3)
+        self.assertNotIn("JOIN", queries[1]["sql"])
+        self.assertNotIn("description", queries[1]["sql"])
+        self.assertNotIn("email", queries[2]["sql"])
+
+    def test_detail_supports_selection(self):
+        response = self.client.get(
+            reverse("task-detail", args=[self.task.id]), {"fields": "name"}
+        )
+        self.assertEqual(response.data, {"name": "Tarea"})
+
+    def test_unknown_field(self):
+        response = self.client.get(self.url, {"fields": "id,owner.nope"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_write_only_nested_field(self):
+        response = self.client.get(self.url, {"fields": "id,owner.password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("task-list-create")
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.state = State.objects.create(name="pendiente")
+        self.priority = Priority.objects.create(name="urgente")
+        self.task = self.create_task("Tarea")
+
+    def create_task(self, name):
+        return Task.objects.create(
+            name=name,
+            description="Descripción",
+            state=self.state,
+            priority=self.priority,
+            deadline="2024-12-31",
+            owner=self.user,
+        )
+
+    def test_list_not_modified(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        # La respuesta sale de la caché: no se leen ni serializan tareas
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+        # Otra página o selección de campos es otra representación
+        response = self.client.get(self.url, {"fields": "id"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_not_modified_on_cache_miss(self):
+        etag = self.client.get(self.url)["ETag"]
+        invalidate_task_lists()
+        # Solo la consulta de agregación: sin página ni serialización
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_list_changes_invalidate_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        other = self.create_task("Otra")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response["ETag"]
+        Task.objects.filter(pk=other.pk).delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_not_modified(self):
+        url = reverse("task-detail", args=[self.task.id])
+        response = self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        etag = self.client.get(url)["ETag"]
+        self.task.assigned_users.add(self.user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["assigned_users"]), 1)
+
+
+class TaskListCacheTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.state = State.objects.create(name="pendiente")
+        self.other_state = State.objects.create(name="hecho")
+        self.priority = Priority.objects.create(name="urgente")
+        self.task = Task.objects.create(
+            name="Tarea",
+            description="Descripción",
+            state=self.state,
+            priority=self.priority,
+            deadline="2024-12-31",
+            owner=self.user,
+        )
+        self.url = reverse("task-by-state-list")
+        self.params = {"state": f"{self.state.id},{self.other_state.id}"}
+
+    def get(self, params=None):
+        return self.client.get(self.url, params or self.params)
+
+    def test_hit_after_miss(self):
+        self.assertEqual(self.get()["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            response = self.get()
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(response.data["results"][0]["name"], "Tarea")
+
+    def test_equivalent_params_share_entry(self):
+        self.get()
+        params = {"state": f" {self.other_state.id},{self.state.id}"}
+        self.assertEqual(self.get(params)["X-Cache"], "HIT")
+
+    def test_repeated_keys_do_not_share_comma_list_entry(self):
+        self.get()
+        # TaskFilter lee solo el último valor de una clave repetida
+        response = self.get({"state": [self.state.id, self.other_state.id]})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"], [])
+
+    def test_writes_invalidate(self):
+        changes = [
+            lambda: Task.objects.filter(pk=self.task.pk).get().save(),
+            lambda: self.task.assigned_users.add(self.user),
+            lambda: Comment.objects.create(
+                text="Comentario", user=self.user, task=self.task
+            ),
+            lambda: self.user.save(),
+        ]
+        for change in changes:
+            self.get()
+            change()
+            self.assertEqual(self.get()["X-Cache"], "MISS")
+
+    def test_login_does_not_invalidate(self):
+        self.get()
+        self.user.save(update_fields=["last_login"])
+        self.assertEqual(self.get()["X-Cache"], "HIT")
+
+    def test_stale_on_database_error(self):
+        self.get()
+        self.task.name = "Renombrada"
+        self.task.save()
+        with mock.patch(
+            "WorkStream.views.task_views.task_list_entry",
+            side_effect=OperationalError,
+        ):
+            response = self.get()
+            self.assertEqual(response["X-Cache"], "STALE")
+            self.assertEqual(response.data["results"][0]["name"], "Tarea")
+
+            invalidate_task_lists()
+            with self.assertRaises(OperationalError):
+                self.get({"state": self.state.id})
+
+
+class ReferenceTableCacheTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.state = State.objects.create(name="Pendiente")
+        self.priority = Priority.objects.create(name="urgente")
+
+    def test_lookups_are_served_from_memory(self):
+        states.load()
+        with self.assertNumQueries(0):
+            self.assertEqual(states.ids_for([], ["pendiente"]), [self.state.id])
+            self.assertEqual(states.ids_for([self.state.id], []), [self.state.id])
+            self.assertEqual(states.get(self.state.id).name, "Pendiente")
+        # Un valor desconocido recarga la tabla una sola vez
+        with self.assertNumQueries(1):
+            self.assertEqual(states.ids_for([self.state.id, 999], []), [self.state.id])
+
+    def test_task_write_validates_from_memory(self):
+        states.load()
+        priorities.load()
+        serializer = TaskWriteSerializer()
+        with self.assertNumQueries(0):
+            state = serializer.fields["state"].run_validation(self.state.id)
+            priority = serializer.fields["priority"].run_validation(
+                str(self.priority.id)
+            )
+        self.assertEqual((state, priority), (self.state, self.priority))
+
+        response = self.client.post(
+            reverse("task-list-create"),
+            {
+                "name": "Tarea",
+                "description": "Descripción",
+                "deadline": "2024-12-31",
+                "state": 999,
+                "priority": self.priority.id,
+                "assigned_users": [],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("state", response.data)
+
+    def test_viewset_changes_invalidate(self):
+        states.load()
+        self.client.put(
+            reverse("state-detail", args=[self.state.id]),
+            {"name": "Terminado"},
+            format="json",
+        )
+        self.assertEqual(states.ids_for([], ["terminado"]), [self.state.id])
+        self.assertEqual(states.ids_for([], ["pendiente"]), [])
+
+        self.client.delete(reverse("state-detail", args=[self.state.id]))
+        self.assertIsNone(states.get(self.state.id))
+
+    def test_reloads_after_ttl_without_version_change(self):
+        states.load()
+        # update() no dispara señales: otro proceso con caché local tampoco
+        # vería la nueva versión
+        State.objects.filter(pk=self.state.pk).update(name="Hecho")
+        self.assertEqual(states.get(self.state.id).name, "Pendiente")
+        with override_settings(WORKSTREAM_REFERENCE_CACHE_TTL=0):
+            self.assertEqual(states.get(self.state.id).name, "Hecho")
+
+    def test_reloads_on_miss_without_version_change(self):
+        states.load()
+        # Fila creada sin cambiar la versión, como desde otro proceso con
+        # caché local
+        (done,) = State.objects.bulk_create([State(name="Hecho")])
+        self.assertEqual(states.ids_for([done.id], []), [done.id])
+        states.load()
+        (blocked,) = State.objects.bulk_create([State(name="Bloqueado")])
+        self.assertEqual(states.ids_for([], ["bloqueado"]), [blocked.id])
+        (review,) = State.objects.bulk_create([State(name="Revisión")])
+        self.assertEqual(states.get(review.id).name, "Revisión")
+
+    def test_warns_about_process_local_cache(self):
+        with override_settings(DEBUG=False):
+            self.assertEqual(
+                [warning.id for warning in shared_cache_check(None)],
+                ["WorkStream.W001"],
+            )
+        with override_settings(DEBUG=True):
+            self.assertEqual(shared_cache_check(None), [])
+
+
+class TaskBulkCreateTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.other = CustomUser.objects.create_user(
+            username="otro", password="1234", email="otro@gmail.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.state = State.objects.create(name="pendiente")
+        self.priority = Priority.objects.create(name="urgente")
+        self.url = reverse("task-list-create")
+
+    def payload(self, amount, assigned_users=None):
+        return [
+            {
+                "name": f"Tarea {i}",
+                "description": "Importada",
+                "deadline": "2024-12-31",
+                "state": self.state.id,
+                "priority": self.priority.id,
+                "assigned_users": assigned_users or [self.user.id, self.other.id],
+            }
+            for i in range(amount)
+        ]
+
+    def test_bulk_create_returns_ids(self):
+        response = self.client.post(self.url, self.payload(3), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        tasks = Task.objects.filter(pk__in=response.data["ids"])
+        self.assertEqual(tasks.count(), 3)
+        self.assertEqual(set(tasks.values_list("owner", flat=True)), {self.user.id})
+        self.assertEqual(
+            Task.assigned_users.through.objects.filter(task__in=tasks).count(), 6
+        )
+
+    def test_query_count_does_not_grow_with_batch(self):
+        states.load()
+        priorities.load()
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, self.payload(2), format="json")
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, self.payload(40), format="json")
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(Task.objects.count(), 42)
+
+    def test_invalid_item_rejects_whole_batch(self):
+        payload = self.payload(2)
+        payload[1]["assigned_users"] = [999]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("assigned_users", response.data[1])
+        self.assertFalse(Task.objects.exists())
+
+
+class TaskDetailPermissionTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.owner = CustomUser.objects.create_user(
+            username="dueño", password="1234", email="owner@gmail.com"
+        )
+        self.assignee = CustomUser.objects.create_user(
+            username="asignado", password="1234", email="assignee@gmail.com"
+        )
+        self.stranger = CustomUser.objects.create_user(
+            username="ajeno", password="1234", email="stranger@gmail.com"
+        )
+        self.task = Task.objects.create(
+            name="Tarea",
+            description="Descripción",
+            state=State.objects.create(name="pendiente"),
+            priority=Priority.objects.create(name="urgente"),
+            deadline="2024-12-31",
+            owner=self.owner,
+        )
+        extra = [
+            CustomUser(username=f"extra{i}", email=f"extra{i}@gmail.com")
+            for i in range(20)
+        ]
+        self.task.assigned_users.add(
+            self.assignee, *CustomUser.objects.bulk_create(extra)
+        )
+        self.url = reverse("task-detail", args=[self.task.id])
+
+    def delete_as(self, user):
+        self.client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(self.url)
+        return response, len(queries)
+
+    def test_forbidden_check_is_one_query(self):
+        response, queries = self.delete_as(self.stranger)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(queries, 1)
+        self.assertTrue(Task.objects.filter(pk=self.task.pk).exists())
+
+    def test_assignee_can_delete(self):
+        response, _ = self.delete_as(self.assignee)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_permission_without_annotation(self):
+        request = mock.Mock(method="DELETE", user=self.assignee)
+        task = Task.objects.get(pk=self.task.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(
+                IsOwnerOrAssignedUser().has_object_permission(request, None, task)
+            )
+        request.user = self.owner
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                IsOwnerOrAssignedUser().has_object_permission(request, None, task)
+            )
+
+
+class TaskBulkUpdateTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.other = CustomUser.objects.create_user(
+            username="otro", password="1234", email="otro@gmail.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.todo = State.objects.create(name="pendiente")
+        self.done = State.objects.create(name="hecho")
+        self.priority = Priority.objects.create(name="urgente")
+        self.url = reverse("task-bulk")
+        self.owned = self.create_task(self.user)
+        self.assigned = self.create_task(self.other)
+        self.assigned.assigned_users.add(self.user)
+        self.foreign = self.create_task(self.other)
+
+    def create_task(self, owner):
+        return Task.objects.create(
+            name="Tarea",
+            description="Descripción",
+            state=self.todo,
+            priority=self.priority,
+            deadline="2024-12-31",
+            owner=owner,
+        )
+
+    def test_update_by_ids(self):
+        ids = [self.owned.id, self.assigned.id, self.foreign.id, 999]
+        states.load()
+        with self.assertNumQueries(4):
+            # SAVEPOINT, bloqueo con permisos, UPDATE y RELEASE
+            response = self.client.patch(
+                self.url,
+                {"ids": ids, "changes": {"state": self.done.id}},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(
+            response.data,
+            {
+                "updated": sorted([self.owned.id, self.assigned.id]),
+                "forbidden": [self.foreign.id],
+                "not_found": [999],
+            },
+        )
+        self.assertEqual(
+            set(Task.objects.filter(state=self.done).values_list("id", flat=True)),
+            {self.owned.id, self.assigned.id},
+        )
+
+    def test_update_by_filter(self):
+        before = Task.objects.get(pk=self.owned.pk).updated_at
+        response = self.client.patch(
+            self.url,
+            {
+                "filter": {"state": "pendiente", "owner": "usuario"},
+                "changes": {"deadline": "2025-01-15"},
+            },
+            format="json",
+        )
+        self.assertEqual(response.data["updated"], [self.owned.id])
+        task = Task.objects.get(pk=self.owned.pk)
+        self.assertEqual(str(task.deadline), "2025-01-15")
+        self.assertGreater(task.updated_at, before)
+
+    def test_invalid_requests(self):
+        for payload in [
+            {"changes": {"state": self.done.id}},
+            {"ids": [self.owned.id], "changes": {}},
+            {"ids": [self.owned.id], "changes": {"state": 999}},
+            {"filter": {"stat": "pendiente"}, "changes": {"state": self.done.id}},
+        ]:
+            with self.subTest(payload=payload):
+                response = self.client.patch(self.url, payload, format="json")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.filter(state=self.done).exists())
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.patch(
+            self.url,
+            {"ids": [self.owned.id], "changes": {"state": self.done.id}},
+            format="json",
+        )
+        self.assertIn(
+            response.status_code,
+            (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN),
+        )
+
+
+class TaskBulkDeleteTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.other = CustomUser.objects.create_user(
+            username="otro", password="1234", email="otro@gmail.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.state = State.objects.create(name="pendiente")
+        self.priority = Priority.objects.create(name="urgente")
+        self.url = reverse("task-bulk")
+
+    def create_task(self, owner, comments=2):
+        task = Task.objects.create(
+            name="Tarea",
+            description="Descripción",
+            state=self.state,
+            priority=self.priority,
+            deadline="2024-12-31",
+            owner=owner,
+        )
+        task.assigned_users.set([self.user, self.other])
+        Comment.objects.bulk_create(
+            Comment(text=f"Comentario {i}", user=owner, task=task)
+            for i in range(comments)
+        )
+        return task
+
+    def test_delete_by_ids(self):
+        owned = [self.create_task(self.user) for _ in range(2)]
+        foreign = Task.objects.create(
+            name="Ajena",
+            description="Descripción",
+            state=self.state,
+            priority=self.priority,
+            deadline="2024-12-31",
+            owner=self.other,
+        )
+        ids = [task.id for task in owned] + [foreign.id, 999]
+        response = self.client.delete(self.url, {"ids": ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(
+            response.data,
+            {
+                "deleted": {"tasks": 2, "comments": 4, "assignments": 4},
+                "forbidden": [foreign.id],
+                "not_found": [999],
+            },
+        )
+        self.assertEqual(list(Task.objects.values_list("id", flat=True)), [foreign.id])
+        self.assertFalse(Comment.objects.exists())
+
+    @override_settings(
+        WORKSTREAM_BULK_BATCH_SIZE=2, WORKSTREAM_BULK_COMMENT_BATCH_SIZE=8
+    )
+    def test_delete_by_filter_in_chunks(self):
+        for _ in range(5):
+            self.create_task(self.user, comments=10)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(
+                self.url, {"filter": {"owner": "usuario"}}, format="json"
+            )
+        self.assertEqual(response.data["deleted"]["tasks"], 5)
+        self.assertEqual(response.data["deleted"]["comments"], 50)
+        self.assertFalse(Task.objects.exists())
+        # Tres bloques; los comentarios de cada bloque (20, 20 y 10) se
+        # borran de a 8 filas; ningún SELECT de comentarios ni asignaciones
+        deletes = [q["sql"] for q in queries if q["sql"].startswith("DELETE")]
+        comment_deletes = [sql for sql in deletes if "WorkStream_comment" in sql]
+        self.assertEqual(len(comment_deletes), 8)
+        self.assertEqual(len(deletes), 14)
+        self.assertFalse(
+            any(
+                q["sql"].startswith("SELECT") and "WorkStream_comment" in q["sql"]
+                for q in queries
+            )
+        )
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        token = WorkStreamRefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.url = reverse("comment-list")
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        return response, [q for q in queries if "WorkStream_customuser" in q["sql"]]
+
+    def test_user_row_is_not_fetched_per_request(self):
+        response, _ = self.user_queries()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response, queries = self.user_queries()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, [])
+
+    def test_revoke_tokens(self):
+        self.user_queries()
+        self.user.revoke_tokens()
+        response, _ = self.user_queries()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoke_tokens_with_string_user_id_claim(self):
+        token = WorkStreamRefreshToken.for_user(self.user)
+        token[api_settings.USER_ID_CLAIM] = str(self.user.id)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+        self.user_queries()
+        self.user.revoke_tokens()
+        response, _ = self.user_queries()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoke_survives_concurrent_read_before_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.revoke_tokens()
+            # Otro pedido lee la versión anterior antes del commit y la guarda
+            cache.set(user_cache_key(self.user.id), (0, True))
+        response, _ = self.user_queries()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(WORKSTREAM_AUTH_LOCAL_TTL=0)
+    def test_local_ttl_follows_settings(self):
+        self.user_queries()
+        # Sin copia local cada pedido consulta la caché compartida
+        cache.delete(user_cache_key(self.user.id))
+        _, queries = self.user_queries()
+        self.assertEqual(len(queries), 1)
+
+    def test_inactive_user(self):
+        self.user.is_active = False
+        self.user.save()
+        response, _ = self.user_queries()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_lightweight_user_loads_deferred_fields(self):
+        user = build_user(id=self.user.id, username="usuario", is_active=True)
+        self.assertEqual(user, self.user)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "test@gmail.com")
+
+
+class TokenRefreshTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.refresh = str(WorkStreamRefreshToken.for_user(self.user))
+        self.url = reverse("token-refresh")
+
+    def post(self, refresh):
+        return self.client.post(self.url, {"refresh": refresh}, format="json")
+
+    def test_refresh_rotates_token(self):
+        response = self.post(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("access", response.data)
+        self.assertNotEqual(response.data["refresh"], self.refresh)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+        response = self.post(response.data["refresh"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_reused_token_is_rejected(self):
+        self.assertEqual(self.post(self.refresh).status_code, status.HTTP_200_OK)
+        response = self.post(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Sin la caché compartida la fila de la lista negra también lo rechaza
+        cache.clear()
+        response = self.post(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoked_tokens_cannot_refresh(self):
+        self.user.revoke_tokens()
+        response = self.post(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+    def test_prune_removes_expired_tokens(self):
+        now = timezone.now()
+        BlacklistedToken.objects.create(jti="vencido", expires_at=now)
+        BlacklistedToken.objects.create(
+            jti="vigente", expires_at=now + timedelta(hours=1)
+        )
+        self.assertEqual(prune_blacklist(now), 1)
+        self.assertEqual(
+            list(BlacklistedToken.objects.values_list("jti", flat=True)), ["vigente"]
+        )
+
+
+class CachedBasicAuthenticationTests(TestCase):
+
+    def setUp(self):
+        _credentials.clear()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.url = reverse("comment-list")
+
+    def get(self, password):
+        credentials = base64.b64encode(f"usuario:{password}".encode()).decode()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Basic {credentials}")
+        with mock.patch(
+            "django.contrib.auth.base_user.check_password", wraps=check_password
+        ) as checked:
+            response = self.client.get(self.url)
+        return response, checked.call_count
+
+    def test_repeated_calls_skip_password_hash(self):
+        self.assertEqual(self.get("1234"), (mock.ANY, 1))
+        response, checks = self.get("1234")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(checks, 0)
+
+    def test_wrong_password_is_not_cached(self):
+        response, _ = self.get("1234")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response, checks = self.get("incorrecta")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(checks, 1)
+
+    def test_password_change_invalidates_cache(self):
+        self.get("1234")
+        self.user.set_password("nueva")
+        self.user.save()
+        response, checks = self.get("1234")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(checks, 1)
+        self.assertEqual(self.get("nueva")[0].status_code, status.HTTP_200_OK)
+
+
+class TaskCommentThreadTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        state = State.objects.create(name="pendiente")
+        priority = Priority.objects.create(name="urgente")
+        self.task, other = [
+            Task.objects.create(
+                name="Tarea",
+                description="Descripción",
+                state=state,
+                priority=priority,
+                deadline="2024-12-31",
+                owner=self.user,
+            )
+            for _ in range(2)
+        ]
+        self.comments = [
+            Comment.objects.create(task=self.task, user=self.user, text=f"c{i}")
+            for i in range(5)
+        ]
+        Comment.objects.create(task=other, user=self.user, text="otra tarea")
+        self.url = reverse("task-comment-list", args=[self.task.id])
+
+    def test_walk_thread_in_order(self):
+        response = self.client.get(self.url, {"page_size": 2})
+        self.assertEqual(
+            response.data["results"][0]["user"],
+            {"id": self.user.id, "username": "usuario"},
+        )
+        seen = [comment["id"] for comment in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            seen += [comment["id"] for comment in response.data["results"]]
+        self.assertEqual(seen, [comment.id for comment in self.comments])
+
+    def test_page_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_task_exposes_comment_stats(self):
+        detail = self.client.get(reverse("task-detail", args=[self.task.id])).data
+        listed = self.client.get(reverse("task-list-create")).data["results"]
+        listed = next(task for task in listed if task["id"] == self.task.id)
+        for data in (detail, listed):
+            self.assertEqual(data["comment_count"], 5)
+            self.assertEqual(
+                parse_datetime(data["last_comment_at"]), self.comments[-1].created_at
+            )
+
+    def test_unknown_task(self):
+        response = self.client.get(reverse("task-comment-list", args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CommentBatchCreateTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        state = State.objects.create(name="pendiente")
+        priority = Priority.objects.create(name="urgente")
+        self.first, self.second = [
+            Task.objects.create(
+                name="Tarea",
+                description="Descripción",
+                state=state,
+                priority=priority,
+                deadline="2024-12-31",
+                owner=self.user,
+            )
+            for _ in range(2)
+        ]
+        self.url = reverse("comment-batch")
+
+    def test_create_across_tasks(self):
+        payload = [
+            {"task": self.first.id, "text": "build verde"},
+            {"task": self.second.id, "text": "build rojo"},
+            {"task": self.first.id, "text": "build verde otra vez"},
+        ]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [item["comment"]["text"] for item in response.data["results"]],
+            [item["text"] for item in payload],
+        )
+        self.assertEqual(
+            set(Comment.objects.filter(user=self.user).values_list("task_id", "text")),
+            {(item["task"], item["text"]) for item in payload},
+        )
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual((self.first.comment_count, self.second.comment_count), (2, 1))
+        self.assertEqual(
+            self.first.last_comment_at,
+            Comment.objects.filter(task=self.first).latest("created_at").created_at,
+        )
+
+    def test_query_count_does_not_grow_with_batch(self):
+        def payload(amount):
+            return [
+                {"task": task.id, "text": f"comentario {i}"}
+                for i in range(amount)
+                for task in (self.first, self.second)
+            ]
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, payload(1), format="json")
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, payload(20), format="json")
+        self.assertEqual(len(large), len(small))
+        self.assertEqual(Comment.objects.count(), 42)
+
+    def test_partial_success(self):
+        payload = [
+            {"task": self.first.id, "text": "ok"},
+            {"task": 999999, "text": "tarea inexistente"},
+            {"task": self.first.id, "text": ""},
+        ]
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            [item["status"] for item in response.data["results"]], [201, 400, 400]
+        )
+        self.assertIn("task", response.data["results"][1]["errors"])
+        self.assertIn("text", response.data["results"][2]["errors"])
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_rejects_invalid_payloads(self):
+        response = self.client.post(self.url, {"task": self.first.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, [], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(WORKSTREAM_COMMENT_BATCH_MAX=1):
+            response = self.client.post(
+                self.url,
+                [{"task": self.first.id, "text": "a"}] * 2,
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, [{"text": "sin tarea"}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Comment.objects.exists())
+
+
+class TaskSearchTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.todo = State.objects.create(name="pendiente")
+        self.done = State.objects.create(name="hecho")
+        priority = Priority.objects.create(name="urgente")
+
+        def create(name, description, state):
+            return Task.objects.create(
+                name=name,
+                description=description,
+                state=state,
+                priority=priority,
+                deadline="2024-12-31",
+                owner=self.user,
+            )
+
+        self.in_name = create("Migrar servidor", "Mover la base", self.todo)
+        self.in_description = create("Infra", "Migrar el servidor viejo", self.done)
+        self.in_comment = create("Backlog", "Pendientes varios", self.todo)
+        Comment.objects.create(
+            task=self.in_comment, user=self.user, text="falta el servidor de correo"
+        )
+        create("Otra", "Nada que ver", self.todo)
+        self.url = reverse("task-search")
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task["id"] for task in response.data["results"]]
+
+    def test_ranks_name_above_description_and_comments(self):
+        self.assertEqual(
+            self.search(q="servidor"),
+            [self.in_name.id, self.in_description.id, self.in_comment.id],
+        )
+
+    def test_vectors_follow_writes(self):
+        self.assertEqual(self.search(q="correo"), [self.in_comment.id])
+        Comment.objects.filter(task=self.in_comment).delete()
+        self.assertEqual(self.search(q="correo"), [])
+
+        self.in_name.name = "Renombrada"
+        self.in_name.save()
+        self.assertEqual(self.search(q="renombrada"), [self.in_name.id])
+
+    def test_oversized_comment(self):
+        # Un log de CI de ~1.6 MB supera el límite de 1 MB de un tsvector
+        self.client.force_authenticate(user=self.user)
+        text = "despliegue " + " ".join(f"linea{i}" for i in range(200000))
+        for _ in range(2):
+            response = self.client.post(
+                reverse("comment-create"),
+                {"task": self.in_comment.id, "text": text},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.post(
+            reverse("comment-batch"),
+            [{"task": self.in_comment.id, "text": text}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = self.client.patch(
+            reverse("task-detail", args=[self.in_comment.id]),
+            {"name": "Backlog largo"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.in_comment.refresh_from_db()
+        self.assertEqual(self.in_comment.comment_count, 4)
+        self.assertEqual(self.search(q="despliegue"), [self.in_comment.id])
+
+    @skipUnless(connection.vendor == "postgresql", "tsvector de PostgreSQL")
+    @override_settings(WORKSTREAM_SEARCH_MAX_COMMENTS=2)
+    def test_indexes_first_comments_only(self):
+        for text in ("segundo aviso", "tercer aviso"):
+            Comment.objects.create(task=self.in_comment, user=self.user, text=text)
+        self.assertEqual(self.search(q="segundo"), [self.in_comment.id])
+        self.assertEqual(self.search(q="tercer"), [])
+        # El recálculo completo usa la misma ventana que el agregado incremental
+        self.in_comment.save()
+        self.assertEqual(self.search(q="segundo"), [self.in_comment.id])
+        self.assertEqual(self.search(q="tercer"), [])
+
+    def test_respects_task_filters(self):
+        self.assertEqual(
+            self.search(q="servidor", state="hecho"), [self.in_description.id]
+        )
+
+    def test_paginates_by_rank(self):
+        first = self.client.get(self.url, {"q": "servidor", "page_size": 2}).data
+        second = self.client.get(first["next"]).data
+        self.assertEqual(
+            [task["id"] for task in first["results"] + second["results"]],
+            self.search(q="servidor"),
+        )
+        self.assertIsNone(second["next"])
+
+    def test_requires_terms(self):
+        response = self.client.get(self.url, {"q": " "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class UserAutocompleteTests(TestCase):
+
+    def setUp(self):
+        forget_autocomplete()
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="zeta", password="1234", email="zeta@gmail.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.ana = CustomUser.objects.create_user(
+            username="ana", email="ana@gmail.com", full_name="Ana Martínez"
+        )
+        self.mario = CustomUser.objects.create_user(
+            username="mario", email="mario@gmail.com", full_name="Mario Anaya"
+        )
+        self.by_email = CustomUser.objects.create_user(
+            username="soporte", email="anabel@gmail.com"
+        )
+        CustomUser.objects.create_user(
+            username="anastasia", email="anastasia@gmail.com", is_active=False
+        )
+        self.url = reverse("user-autocomplete")
+
+    def test_prefix_matches_ranked_by_field(self):
+        response = self.client.get(self.url, {"q": "AN"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data[0],
+            {
+                "id": self.ana.id,
+                "username": "ana",
+                "full_name": "Ana Martínez",
+                "avatar_thumb": None,
+            },
+        )
+        self.assertEqual(
+            [user["id"] for user in response.data], [self.ana.id, self.by_email.id]
+        )
+
+    def test_limit_and_hot_prefix_cache(self):
+        response = self.client.get(self.url, {"q": "a", "limit": 1})
+        self.assertEqual(len(response.data), 1)
+        with self.assertNumQueries(0):
+            self.client.get(self.url, {"q": "A", "limit": 1})
+
+        self.ana.full_name = "Ana María"
+        self.ana.save()
+        response = self.client.get(self.url, {"q": "a", "limit": 1})
+        self.assertEqual(response.data[0]["full_name"], "Ana María")
+
+    def test_bulk_created_users_are_listed(self):
+        self.assertEqual(self.client.get(self.url, {"q": "nuevo"}).data, [])
+        serializer = CustomUserSerializer(
+            data=[{"email": "nuevo@example.com", "password": "clave"}], many=True
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.captureOnCommitCallbacks(execute=True):
+            serializer.save()
+        response = self.client.get(self.url, {"q": "nuevo"})
+        self.assertEqual([user["username"] for user in response.data], ["nuevo"])
+
+    def test_empty_term(self):
+        self.assertEqual(self.client.get(self.url, {"q": " "}).data, [])
+
+    @skipUnless(connection.vendor == "postgresql", "índices de PostgreSQL")
+    def test_prefix_uses_indexes(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = (
+            CustomUser.objects.filter(
+                Q(username__istartswith="an") | Q(email__istartswith="an")
+            )
+            .values("id")
+            .explain()
+        )
+        self.assertIn("user_username_prefix_idx", plan)
+        self.assertIn("user_email_prefix_idx", plan)
+
+
+class TaskStatsTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="usuario", password="1234", email="test@gmail.com"
+        )
+        self.other = CustomUser.objects.create_user(
+            username="otro", password="1234", email="otro@gmail.com"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.todo = State.objects.create(name="pendiente")
+        self.done = State.objects.create(name="hecho")
+        self.priority = Priority.objects.create(name="urgente")
+        self.future = timezone.localdate() + timedelta(days=30)
+        self.late = self.create_task(self.user, self.todo, "2024-12-31")
+        self.pending = self.create_task(self.user, self.done, self.future)
+        self.foreign = self.create_task(self.other, self.todo, "2024-12-31")
+        self.late.assigned_users.add(self.other)
+        self.foreign.assigned_users.add(self.user)
+        self.url = reverse("task-stats")
+
+    def create_task(self, owner, state, deadline):
+        return Task.objects.create(
+            name="Tarea",
+            description="Descripción",
+            state=state,
+            priority=self.priority,
+            deadline=deadline,
+            owner=owner,
+        )
+
+    def test_grouped_counts(self):
+        with self.assertNumQueries(4):
+            # Un GROUP BY por dimensión
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "total": 3,
+                "overdue": 2,
+                "by_state_priority": [
+                    {"state": self.todo.id, "priority": self.priority.id, "count": 2},
+                    {"state": self.done.id, "priority": self.priority.id, "count": 1},
+                ],
+                "by_owner": [
+                    {"owner": self.user.id, "count": 2},
+                    {"owner": self.other.id, "count": 1},
+                ],
+                "by_assignee": [
+                    {"user": self.user.id, "count": 1},
+                    {"user": self.other.id, "count": 1},
+                ],
+            },
+        )
+
+    def test_respects_task_filters(self):
+        response = self.client.get(self.url, {"owner": "usuario"})
+        self.assertEqual(response.data["total"], 2)
+        self.assertEqual(response.data["overdue"], 1)
+        self.assertEqual(
+            response.data["by_assignee"], [{"user": self.other.id, "count": 1}]
+        )
+
+        response = self.client.get(self.url, {"deadline_before": "bad"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(WORKSTREAM_TASK_STATS_SUMMARY=True)
+    def test_summary_follows_writes(self):
+        call_command("rebuild_task_stats", stdout=mock.MagicMock())
+
+        def assert_summary_matches():
+            with self.assertNumQueries(1):
+                summary = self.client.get(self.url).data
+            self.assertEqual(summary, task_stats(Task.objects.all()))
+
+        assert_summary_matches()
+
+        task = self.create_task(self.other, self.done, self.future)
+        task.assigned_users.add(self.user, self.other)
+        assert_summary_matches()
+
+        task.state = self.todo
+        task.deadline = "2024-01-01"
+        task.save()
+        task.name = "Renombrada"
+        task.save(update_fields=["name"])
+        assert_summary_matches()
+
+        task.assigned_users.remove(self.user)
+        self.user.tasks_assigned.clear()
+        assert_summary_matches()
+
+        bulk_url = reverse("task-bulk")
+        self.client.patch(
+            bulk_url,
+            {
+                "ids": [self.late.id, self.pending.id],
+                "changes": {"state": self.todo.id},
+            },
+            format="json",
+        )
+        assert_summary_matches()
+
+        self.client.post(
+            reverse("task-list-create"),
+            [
+                {
+                    "name": "Importada",
+                    "description": "Importada",
+                    "deadline": "2024-12-31",
+                    "state": self.done.id,
+                    "priority": self.priority.id,
+                    "assigned_users": [self.other.id],
+                }
+            ],
+            format="json",
+        )
+        assert_summary_matches()
+
+        self.client.delete(bulk_url, {"ids": [self.late.id]}, format="json")
+        task.delete()
+        assert_summary_matches()
+
+        self.other.delete()
+        assert_summary_matches()
+
+    @override_settings(WORKSTREAM_TASK_STATS_SUMMARY=True)
+    def test_rebuild_repairs_summary(self):
+        TaskStatsBucket.objects.all().delete()
+        TaskStatsBucket.objects.create(dimension="owner", key="999", count=5)
+        call_command("rebuild_task_stats", stdout=mock.MagicMock())
+        self.assertEqual(self.client.get(self.url).data, task_stats(Task.objects.all()))
+        self.assertFalse(TaskStatsBucket.objects.filter(key="999").exists())
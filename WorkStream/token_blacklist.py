@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone as django_timezone
+
+from WorkStream.models import BlacklistedToken
+
+
+def blacklist_cache_key(jti):
+    return f"workstream:jwt:blacklist:{jti}"
+
+
+def expiry_datetime(exp):
+    return datetime.fromtimestamp(exp, tz=timezone.utc)
+
+
+def is_blacklisted(jti):
+    if cache.get(blacklist_cache_key(jti)):
+        return True
+    return BlacklistedToken.objects.filter(jti=jti).exists()
+
+
+def consume(jti, exp):
+    """
+    Marca el token como usado. Devuelve False si ya lo estaba.
+
+    La comprobación y la escritura son un único INSERT contra el índice único
+    de `jti`: dos rotaciones concurrentes del mismo token no pueden ganar las
+    dos. La caché compartida responde sin ir a la base los reintentos de un
+    token ya consumido.
+    """
+    key = blacklist_cache_key(jti)
+    if cache.get(key):
+        return False
+    expires_at = expiry_datetime(exp)
+    try:
+        with transaction.atomic():
+            BlacklistedToken.objects.create(jti=jti, expires_at=expires_at)
+    except IntegrityError:
+        consumed = False
+    else:
+        consumed = True
+    timeout = (expires_at - django_timezone.now()).total_seconds()
+    if timeout > 0:
+        cache.set(key, True, timeout)
+    return consumed
+
+
+def prune_blacklist(now=None):
+    # Un token vencido ya no pasa la validación de `exp`: su fila sobra
+    deleted, _ = BlacklistedToken.objects.filter(
+        expires_at__lte=now or django_timezone.now()
+    ).delete()
+    return deleted
@@ -0,0 +1,16 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class WorkStreamRefreshToken(RefreshToken):
+    """
+    Refresh token con los datos que necesita la autenticación sin estado.
+    El access token derivado copia estos claims.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token["username"] = user.username
+        token["is_active"] = user.is_active
+        token["ver"] = user.token_version
+        return token
@@ -1,8 +1,16 @@
 from WorkStream.views.comment_views import (
+    CommentBatchCreateAPIView,
     CommentCreateAPIView,
     CommentListAPIView,
     CommentRetrieveUpdateDestroyAPIView,
+    TaskCommentListAPIView,
 )
 from WorkStream.views.priority_views import PriorityViewSet
 from WorkStream.views.state_views import StateViewSet
-from WorkStream.views.users import CustomUserViewSet, LoginAPIView, RegisterAPIView
+from WorkStream.views.users import (
+    CustomUserViewSet,
+    LoginAPIView,
+    RefreshTokenAPIView,
+    RegisterAPIView,
+    UserAutocompleteAPIView,
+)
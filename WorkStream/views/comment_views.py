@@ -1,16 +1,25 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.http import Http404
 from django.shortcuts import Http404, get_object_or_404
 from django.utils.decorators import method_decorator
+from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics, status
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from WorkStream.bulk import create_comments
 from WorkStream.models import Comment, Task
+from WorkStream.pagination import CommentCursorPagination
 from WorkStream.permissions import IsCommentOwner
-from WorkStream.serializers import CommentSerializer
+from WorkStream.serializers import (
+    CommentBatchItemSerializer,
+    CommentSerializer,
+    TaskCommentSerializer,
+)
+from WorkStream.serializers.task_serializers import int_values
 
 User = get_user_model()
 
@@ -29,6 +38,54 @@ class CommentListAPIView(generics.ListAPIView):
         return super().get(request, *args, **kwargs)
 
 
+class TaskCommentListAPIView(generics.ListAPIView):
+    """
+    Hilo de comentarios de una tarea, del más antiguo al más nuevo, paginado
+    por cursor sobre (created_at, id): cada página es un rango del índice
+    `comment_task_created_idx` con el autor en el mismo JOIN.
+    """
+
+    serializer_class = TaskCommentSerializer
+    pagination_class = CommentCursorPagination
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return (
+            Comment.objects.filter(task_id=self.kwargs["pk"])
+            .select_related("user")
+            .only("id", "text", "created_at", "task_id", "user__id", "user__username")
+        )
+
+    @swagger_auto_schema(
+        operation_description="Lista paginada de los comentarios de una tarea",
+        manual_parameters=[
+            openapi.Parameter(
+                CommentCursorPagination.cursor_query_param,
+                openapi.IN_QUERY,
+                description="Cursor opaco devuelto en los enlaces next/previous",
+                type=openapi.TYPE_STRING,
+            ),
+            openapi.Parameter(
+                CommentCursorPagination.page_size_query_param,
+                openapi.IN_QUERY,
+                description="Cantidad de comentarios por página",
+                type=openapi.TYPE_INTEGER,
+            ),
+        ],
+        responses={200: TaskCommentSerializer(many=True), 404: "Not Found"},
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        # Solo una página vacía requiere confirmar que la tarea existe
+        if not page and not Task.objects.filter(pk=self.kwargs["pk"]).exists():
+            raise NotFound("La tarea no existe")
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
 @method_decorator(
     name="post",
     decorator=swagger_auto_schema(operation_description="Creación de comentarios"),
@@ -78,6 +135,78 @@ class CommentCreateAPIView(generics.CreateAPIView):
             )
 
 
+class CommentBatchCreateAPIView(generics.GenericAPIView):
+    """
+    Alta de muchos comentarios (de una o varias tareas) en un pedido.
+
+    Las tareas referenciadas se resuelven con una sola consulta `IN`, los
+    comentarios válidos se insertan con `bulk_create` y la respuesta trae un
+    resultado por elemento, en el mismo orden: 201 si se creó o 400 con sus
+    errores. El estado general es 201 si se crearon todos, 207 si solo
+    algunos y 400 si ninguno.
+    """
+
+    serializer_class = CommentBatchItemSerializer
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Crea varios comentarios en un solo pedido",
+        request_body=CommentBatchItemSerializer(many=True),
+        responses={201: "Created", 207: "Multi-Status", 400: "Bad Request"},
+    )
+    def post(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {"error": "Se esperaba una lista de comentarios"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not items:
+            return Response(
+                {"error": "La lista de comentarios está vacía"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = getattr(settings, "WORKSTREAM_COMMENT_BATCH_MAX", 500)
+        if len(items) > limit:
+            return Response(
+                {"error": f"Se permiten hasta {limit} comentarios por pedido"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        task_ids = int_values(
+            [item.get("task") for item in items if isinstance(item, dict)]
+        )
+        tasks = Task.objects.filter(pk__in=set(task_ids)).order_by().only("id")
+        context = self.get_serializer_context()
+        context["preloaded"] = {Task: {task.pk: task for task in tasks}}
+
+        results, valid = [], []
+        for item in items:
+            serializer = self.get_serializer_class()(data=item, context=context)
+            if serializer.is_valid():
+                valid.append((len(results), serializer.validated_data))
+                results.append(None)
+            else:
+                results.append(
+                    {"status": status.HTTP_400_BAD_REQUEST, "errors": serializer.errors}
+                )
+
+        comments = create_comments(request.user, [data for _, data in valid])
+        for (index, _), comment in zip(valid, comments):
+            results[index] = {
+                "status": status.HTTP_201_CREATED,
+                "comment": self.get_serializer(comment).data,
+            }
+
+        if len(comments) == len(items):
+            response_status = status.HTTP_201_CREATED
+        elif comments:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({"results": results}, status=response_status)
+
+
 class CommentRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
 
     queryset = Comment.objects.all()
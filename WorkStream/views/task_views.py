@@ -1,34 +1,186 @@
-from django.db.models import Q
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import DatabaseError
+from django.http import StreamingHttpResponse
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from WorkStream.bulk import delete_tasks, update_tasks
+from WorkStream.cache import TaskListCache
+from WorkStream.conditional import TaskValidators
+from WorkStream.filters import TaskFilter
+from WorkStream.models import Task
+from WorkStream.pagination import TaskCursorPagination, TaskSearchPagination
+from WorkStream.permissions import (
+    IsAuthenticatedOrReadOnly,
+    IsOwnerOrAssignedUser,
+    with_owner_or_assignee,
+)
+from WorkStream.search import search_tasks
+from WorkStream.stats import task_stats as task_stats_data
+from WorkStream.serializers import (
+    FieldSelection,
+    TaskBulkUpdateSerializer,
+    TaskFastReadSerializer,
+    TaskReadSerializer,
+    TaskTargetSerializer,
+    TaskWriteSerializer,
+)
+
+pagination_parameters = [
+    openapi.Parameter(
+        TaskCursorPagination.cursor_query_param,
+        openapi.IN_QUERY,
+        description="Cursor opaco devuelto en los enlaces next/previous",
+        type=openapi.TYPE_STRING,
+    ),
+    openapi.Parameter(
+        TaskCursorPagination.page_size_query_param,
+        openapi.IN_QUERY,
+        description="Cantidad de tareas por página",
+        type=openapi.TYPE_INTEGER,
+    ),
+]
+
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_CONTENT_TYPES = {"json": "application/json", "jsonl": "application/x-ndjson"}
+
 
-from WorkStream.models import CustomUser, Priority, State, Task
-from WorkStream.permissions import IsAuthenticatedOrReadOnly, IsOwnerOrAssignedUser
-from WorkStream.serializers import TaskReadSerializer, TaskWriteSerializer
+filter_parameters = [
+    openapi.Parameter(
+        name,
+        openapi.IN_QUERY,
+        description=description,
+        type=openapi.TYPE_STRING,
+    )
+    for name, description in [
+        (
+            "state",
+            "IDs o nombres de estado separados por comas; un número que no es "
+            "el ID de ningún estado se busca como nombre",
+        ),
+        (
+            "priority",
+            "IDs o nombres de prioridad separados por comas; un número que no "
+            "es el ID de ninguna prioridad se busca como nombre",
+        ),
+        (
+            "owner",
+            "IDs o usernames del dueño separados por comas; un número que no es "
+            "el ID del dueño de ninguna tarea se busca como username",
+        ),
+        (
+            "assigned_users",
+            "IDs o usernames de usuarios asignados separados por comas; un "
+            "número que no es el ID de ningún usuario asignado se busca como "
+            "username",
+        ),
+        ("deadline", "Fecha exacta (YYYY-MM-DD)"),
+        ("deadline_before", "Tareas con fecha anterior a (YYYY-MM-DD)"),
+        ("deadline_after", "Tareas con fecha posterior a (YYYY-MM-DD)"),
+    ]
+]
+
+
+selection_parameters = [
+    openapi.Parameter(
+        "fields",
+        openapi.IN_QUERY,
+        description="Campos a devolver separados por comas; admite relación.campo",
+        type=openapi.TYPE_STRING,
+    ),
+    openapi.Parameter(
+        "expand",
+        openapi.IN_QUERY,
+        description="Relaciones a anidar; las demás se devuelven como ids",
+        type=openapi.TYPE_STRING,
+    ),
+]
+
+
+def paginated_task_response(request, tasks, pagination_class=TaskCursorPagination):
+    serializer = TaskFastReadSerializer(
+        FieldSelection.from_request(request), pagination_class
+    )
+    paginator = pagination_class()
+    page = paginator.paginate_queryset(serializer.get_queryset(tasks), request)
+    return paginator.get_paginated_response(serializer.to_representation(page))
+
+
+def task_list_entry(request, tasks, validators):
+    return {
+        "etag": validators.etag,
+        "last_modified": validators.last_modified,
+        "data": paginated_task_response(request, tasks).data,
+    }
+
+
+def filtered_task_response(request, params):
+    filterset = TaskFilter(params, queryset=Task.objects.all())
+    if not filterset.is_valid():
+        return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    task_cache = TaskListCache(request, params, TaskFilter.LIST_FILTERS)
+    entry = task_cache.get()
+    cache_status = "HIT"
+    if entry is None:
+        try:
+            # El 304 sale de la consulta de agregación, sin paginar ni
+            # serializar; en ese caso no hay página que guardar
+            validators = TaskValidators.for_tasks(request, filterset.qs)
+            response = validators.not_modified(request)
+            if response:
+                response["X-Cache"] = "MISS"
+                return response
+            entry = task_list_entry(request, filterset.qs, validators)
+        except DatabaseError:
+            # Ante una falla de la base se sirve la última copia conocida
+            entry = task_cache.get_stale()
+            if entry is None:
+                raise
+            cache_status = "STALE"
+        else:
+            task_cache.set(entry)
+            cache_status = "MISS"
+
+    validators = TaskValidators(entry["etag"], entry["last_modified"])
+    response = validators.not_modified(request) or validators.apply(
+        Response(entry["data"])
+    )
+    response["X-Cache"] = cache_status
+    return response
 
 
 @swagger_auto_schema(
     method="get",
-    operation_description="Obtiene una lista de todas las tareas.",
-    responses={200: TaskReadSerializer(many=True)},
+    operation_description="Obtiene una lista paginada de tareas. Los filtros se pueden combinar.",
+    manual_parameters=filter_parameters + pagination_parameters + selection_parameters,
+    responses={
+        200: TaskReadSerializer(many=True),
+        304: "Not Modified",
+        400: "Bad Request",
+    },
 )
 @swagger_auto_schema(
     method="post",
-    operation_description="Crea una nueva tarea. Acepta múltiples tareas si se envía una lista.",
+    operation_description="Crea una nueva tarea. Acepta múltiples tareas si se envía una lista; en ese caso se insertan en bloque y se devuelven los ids creados.",
     request_body=TaskWriteSerializer(many=True),
-    responses={201: TaskWriteSerializer(many=True), 400: "Bad Request"},
+    responses={201: TaskWriteSerializer, 400: "Bad Request"},
 )
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def task_list_create(request):
 
     if request.method == "GET":
-        tasks = Task.objects.all()
-        serializer = TaskReadSerializer(tasks, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return filtered_task_response(request, request.GET)
     elif request.method == "POST":
         is_many = isinstance(request.data, list)
         serializer = TaskWriteSerializer(
@@ -36,14 +188,190 @@ def task_list_create(request):
         )
         if serializer.is_valid():
             serializer.save()
+            if is_many:
+                # En lotes grandes se devuelven solo los ids creados
+                return Response(
+                    {"ids": [task.pk for task in serializer.instance]},
+                    status=status.HTTP_201_CREATED,
+                )
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def stream_tasks(tasks, output, selection=None):
+    # Las tareas se leen en bloques desde un cursor del lado del servidor y se
+    # escribe un fragmento por bloque, así la memoria no depende del tamaño de
+    # la tabla.
+    serializer = TaskFastReadSerializer(selection)
+    rows = serializer.get_queryset(
+        tasks.order_by(*TaskCursorPagination.ordering)
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    separator = "[" if output == "json" else ""
+    for chunk in iter(lambda: list(islice(rows, EXPORT_CHUNK_SIZE)), []):
+        parts = []
+        for task in serializer.to_representation(chunk):
+            data = json.dumps(
+                task, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+            )
+            if output == "jsonl":
+                parts.append(data + "\n")
+            else:
+                parts.append(separator + data)
+                separator = ","
+        yield "".join(parts)
+    if output == "json":
+        yield "[]" if separator == "[" else "]"
+
+
+async def stream_async(chunks):
+    # Bajo ASGI Django consume un iterador síncrono entero en memoria antes de
+    # enviarlo; se entrega uno asíncrono que pide cada bloque al hilo de la
+    # base (thread_sensitive), donde vive el cursor del lado del servidor.
+    next_chunk = sync_to_async(next)
+    while (chunk := await next_chunk(chunks, None)) is not None:
+        yield chunk
+
+
+@swagger_auto_schema(
+    method="get",
+    operation_description="Exporta las tareas filtradas como JSON o JSON Lines en streaming.",
+    manual_parameters=[
+        openapi.Parameter(
+            "output",
+            openapi.IN_QUERY,
+            description="Formato de salida (json, jsonl)",
+            type=openapi.TYPE_STRING,
+            default="json",
+        ),
+    ]
+    + filter_parameters
+    + selection_parameters,
+    responses={200: TaskReadSerializer(many=True), 400: "Bad Request"},
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def task_export(request):
+    output = request.GET.get("output", "json")
+    if output not in EXPORT_CONTENT_TYPES:
+        return Response(
+            {"error": "Formato de exportación no soportado"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    filterset = TaskFilter(request.GET, queryset=Task.objects.all())
+    if not filterset.is_valid():
+        return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    # La selección se valida antes de empezar a escribir la respuesta
+    selection = FieldSelection.from_request(request)
+    TaskFastReadSerializer(selection)
+    chunks = stream_tasks(filterset.qs, output, selection)
+    if isinstance(request._request, ASGIRequest):
+        chunks = stream_async(chunks)
+    response = StreamingHttpResponse(
+        chunks, content_type=EXPORT_CONTENT_TYPES[output]
+    )
+    response["Content-Disposition"] = f'attachment; filename="tasks.{output}"'
+    return response
+
+
+@swagger_auto_schema(
+    method="patch",
+    operation_description="Aplica los mismos cambios (estado, prioridad, fecha) a varias tareas con una sola sentencia UPDATE. Solo se modifican las tareas de las que el usuario es dueño o asignado.",
+    request_body=TaskBulkUpdateSerializer,
+    responses={
+        200: "Ids actualizados, prohibidos y no encontrados",
+        400: "Bad Request",
+    },
+)
+@swagger_auto_schema(
+    method="delete",
+    operation_description="Elimina varias tareas junto con sus comentarios y asignaciones, en bloques. Solo se eliminan las tareas de las que el usuario es dueño o asignado.",
+    request_body=TaskTargetSerializer,
+    responses={
+        200: "Cantidades eliminadas e ids prohibidos y no encontrados",
+        400: "Bad Request",
+    },
+)
+@api_view(["PATCH", "DELETE"])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def task_bulk(request):
+    if request.method == "PATCH":
+        serializer = TaskBulkUpdateSerializer(data=request.data)
+    else:
+        serializer = TaskTargetSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    data = serializer.validated_data
+    if request.method == "PATCH":
+        result = update_tasks(
+            request.user, data["tasks"], data["changes"], data.get("ids", ())
+        )
+    else:
+        result = delete_tasks(request.user, data["tasks"], data.get("ids", ()))
+    return Response(result)
+
+
+@swagger_auto_schema(
+    method="get",
+    operation_description="Cantidad de tareas por estado y prioridad, por dueño y por usuario asignado, y cuántas están vencidas. Admite los mismos filtros que /tasks/.",
+    manual_parameters=filter_parameters,
+    responses={200: "Totales agrupados", 400: "Bad Request"},
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def task_stats(request):
+    filterset = TaskFilter(request.GET, queryset=Task.objects.all())
+    if not filterset.is_valid():
+        return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    # Sin filtros se puede responder desde la tabla resumen
+    filtered = any(request.GET.get(name) for name in filterset.filters)
+    return Response(task_stats_data(filterset.qs if filtered else None))
+
+
+@swagger_auto_schema(
+    method="get",
+    operation_description="Busca tareas por texto en nombre, descripción y comentarios, ordenadas por relevancia. Admite los mismos filtros que /tasks/.",
+    manual_parameters=[
+        openapi.Parameter(
+            "q",
+            openapi.IN_QUERY,
+            description='Texto a buscar; admite "frases", OR y -palabra',
+            type=openapi.TYPE_STRING,
+            required=True,
+        ),
+    ]
+    + filter_parameters
+    + pagination_parameters
+    + selection_parameters,
+    responses={200: TaskReadSerializer(many=True), 400: "Bad Request"},
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def task_search(request):
+    terms = request.GET.get("q", "").strip()
+    if not terms:
+        return Response(
+            {"q": "Se requiere un texto de búsqueda"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    filterset = TaskFilter(request.GET, queryset=Task.objects.all())
+    if not filterset.is_valid():
+        return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    return paginated_task_response(
+        request, search_tasks(filterset.qs, terms), TaskSearchPagination
+    )
+
+
 @swagger_auto_schema(
     method="get",
     operation_description="Obtiene los detalles de una tarea específica.",
-    responses={200: TaskReadSerializer, 404: "Not Found"},
+    manual_parameters=selection_parameters,
+    responses={200: TaskReadSerializer, 304: "Not Modified", 404: "Not Found"},
 )
 @swagger_auto_schema(
     method="put",
@@ -65,8 +393,20 @@ def task_list_create(request):
 @api_view(["GET", "PUT", "PATCH", "DELETE"])
 @permission_classes([IsAuthenticatedOrReadOnly, IsOwnerOrAssignedUser])
 def tasks_detail(request, pk, format=None):
+    tasks = Task.objects.all()
+    if request.method == "GET":
+        validators = TaskValidators.for_tasks(request, tasks.filter(pk=pk))
+        not_modified = validators.not_modified(request)
+        if not_modified:
+            return not_modified
+        selection = FieldSelection.from_request(request)
+        tasks = TaskReadSerializer.setup_eager_loading(tasks, selection)
+    else:
+        # El permiso viaja en la misma consulta que la tarea (EXISTS)
+        tasks = with_owner_or_assignee(tasks, request.user)
+
     try:
-        task = Task.objects.get(pk=pk)
+        task = tasks.get(pk=pk)
     except Task.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
@@ -77,8 +417,8 @@ def tasks_detail(request, pk, format=None):
         )
 
     if request.method == "GET":
-        serializer = TaskReadSerializer(task)
-        return Response(serializer.data)
+        serializer = TaskReadSerializer(task, selection=selection)
+        return validators.apply(Response(serializer.data))
 
     elif request.method in ["PUT", "PATCH"]:
         serializer = TaskWriteSerializer(
@@ -99,7 +439,7 @@ def tasks_detail(request, pk, format=None):
 
 @swagger_auto_schema(
     method="get",
-    operation_description="Obtiene una lista de tareas filtradas por estado.",
+    operation_description="Obtiene una lista de tareas filtradas por estado. Equivale a /tasks/?state=.",
     manual_parameters=[
         openapi.Parameter(
             "state",
@@ -107,35 +447,24 @@ def tasks_detail(request, pk, format=None):
             description="ID o nombre del estado",
             type=openapi.TYPE_STRING,
         ),
-    ],
-    responses={200: TaskReadSerializer(many=True), 404: "Not Found"},
+    ]
+    + pagination_parameters
+    + selection_parameters,
+    responses={
+        200: TaskReadSerializer(many=True),
+        304: "Not Modified",
+        400: "Bad Request",
+    },
 )
 @api_view(["GET"])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def task_by_state_list(request):
-
-    state_param = request.GET.get("state")
-    if state_param:
-        try:
-            state = State.objects.get(pk=state_param)
-        except (State.DoesNotExist, ValueError):
-            try:
-                state = State.objects.get(name__iexact=state_param)
-            except State.DoesNotExist:
-                return Response(
-                    {"error": "Estado no encontrado"}, status=status.HTTP_404_NOT_FOUND
-                )
-        tasks = Task.objects.filter(state=state)
-    else:
-        tasks = Task.objects.all()
-
-    serializer = TaskReadSerializer(tasks, many=True)
-    return Response(serializer.data)
+    return filtered_task_response(request, request.GET)
 
 
 @swagger_auto_schema(
     method="get",
-    operation_description="Obtiene una lista de tareas filtradas por prioridad.",
+    operation_description="Obtiene una lista de tareas filtradas por prioridad. Equivale a /tasks/?priority=.",
     manual_parameters=[
         openapi.Parameter(
             "priority",
@@ -143,36 +472,24 @@ def task_by_state_list(request):
             description="ID o nombre de la prioridad",
             type=openapi.TYPE_STRING,
         ),
-    ],
-    responses={200: TaskReadSerializer(many=True), 404: "Not Found"},
+    ]
+    + pagination_parameters
+    + selection_parameters,
+    responses={
+        200: TaskReadSerializer(many=True),
+        304: "Not Modified",
+        400: "Bad Request",
+    },
 )
 @api_view(["GET"])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def task_by_priority_list(request):
-
-    priority_param = request.GET.get("priority")
-    if priority_param:
-        try:
-            priority = Priority.objects.get(pk=priority_param)
-        except (Priority.DoesNotExist, ValueError):
-            try:
-                priority = Priority.objects.get(name__iexact=priority_param)
-            except Priority.DoesNotExist:
-                return Response(
-                    {"error": "Prioridad no encontrada"},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
-        tasks = Task.objects.filter(priority=priority)
-    else:
-        tasks = Task.objects.all()
-
-    serializer = TaskReadSerializer(tasks, many=True)
-    return Response(serializer.data)
+    return filtered_task_response(request, request.GET)
 
 
 @swagger_auto_schema(
     method="get",
-    operation_description="Obtiene una lista de tareas filtradas por fecha exacta, tareas antes de cierta fecha y tareas posteriores a cierta fecha.",
+    operation_description="Obtiene una lista de tareas filtradas por fecha exacta, tareas antes de cierta fecha y tareas posteriores a cierta fecha. Equivale a /tasks/?deadline=, ?deadline_before= y ?deadline_after=.",
     manual_parameters=[
         openapi.Parameter(
             "deadline",
@@ -187,39 +504,28 @@ def task_by_priority_list(request):
             description="Tipo de filtro (exact, before, after)",
             type=openapi.TYPE_STRING,
         ),
-    ],
-    responses={200: TaskReadSerializer(many=True), 404: "Not Found"},
+    ]
+    + pagination_parameters
+    + selection_parameters,
+    responses={
+        200: TaskReadSerializer(many=True),
+        304: "Not Modified",
+        400: "Bad Request",
+    },
 )
 @api_view(["GET"])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def task_by_deadline(request):
-
-    deadline_param = request.GET.get("deadline")
-    filter_type = request.GET.get("filter", "exact")
-    if deadline_param:
-        try:
-            if filter_type == "before":
-                tasks = Task.objects.filter(deadline__lt=deadline_param)
-            elif filter_type == "after":
-                tasks = Task.objects.filter(deadline__gt=deadline_param)
-            else:
-                tasks = Task.objects.filter(deadline=deadline_param)
-
-        except ValueError:
-            return Response(
-                {"error": "No hay tarea con la fecha proporcionada"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-    else:
-        tasks = Task.objects.all()
-
-    serializer = TaskReadSerializer(tasks, many=True)
-    return Response(serializer.data)
+    params = request.GET.copy()
+    filter_type = params.pop("filter", ["exact"])[-1]
+    if "deadline" in params and filter_type in ("before", "after"):
+        params[f"deadline_{filter_type}"] = params.pop("deadline")[-1]
+    return filtered_task_response(request, params)
 
 
 @swagger_auto_schema(
     method="get",
-    operation_description="Obtiene una lista de tareas filtradas por dueño de la tarjeta.",
+    operation_description="Obtiene una lista de tareas filtradas por dueño de la tarjeta. Equivale a /tasks/?owner=.",
     manual_parameters=[
         openapi.Parameter(
             "owner",
@@ -227,35 +533,24 @@ def task_by_deadline(request):
             description="ID o nombre de usuario del dueño de la tarjeta",
             type=openapi.TYPE_STRING,
         ),
-    ],
-    responses={200: TaskReadSerializer(many=True), 404: "Not Found"},
+    ]
+    + pagination_parameters
+    + selection_parameters,
+    responses={
+        200: TaskReadSerializer(many=True),
+        304: "Not Modified",
+        400: "Bad Request",
+    },
 )
 @api_view(["GET", "POST"])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def task_by_owner(request):
-    owner_param = request.GET.get("owner")
-    if owner_param:
-        try:
-            owner = CustomUser.objects.get(pk=owner_param)
-        except (CustomUser.DoesNotExist, ValueError):
-            try:
-                owner = CustomUser.objects.get(username=owner_param)
-            except CustomUser.DoesNotExist:
-                return Response(
-                    {"error": "No hay tarea con ese dueño"},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
-        tasks = Task.objects.filter(owner=owner)
-    else:
-        tasks = Task.objects.all()
-
-    serializer = TaskReadSerializer(tasks, many=True)
-    return Response(serializer.data)
+    return filtered_task_response(request, request.GET)
 
 
 @swagger_auto_schema(
     method="get",
-    operation_description="Obtiene una lista de tareas filtradas por usuarios asignados.",
+    operation_description="Obtiene una lista de tareas filtradas por usuarios asignados. Equivale a /tasks/?assigned_users=.",
     manual_parameters=[
         openapi.Parameter(
             "assigned_users",
@@ -263,26 +558,16 @@ def task_by_owner(request):
             description="ID o nombre de usuario del usuario asignado",
             type=openapi.TYPE_STRING,
         ),
-    ],
-    responses={200: TaskReadSerializer(many=True), 404: "Not Found"},
+    ]
+    + pagination_parameters
+    + selection_parameters,
+    responses={
+        200: TaskReadSerializer(many=True),
+        304: "Not Modified",
+        400: "Bad Request",
+    },
 )
 @api_view(["GET"])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def task_by_assigned_users(request):
-    assigned_users_param = request.GET.get("assigned_users")
-    if assigned_users_param:
-        try:
-            assigned_users = CustomUser.objects.get(
-                Q(pk=assigned_users_param) | Q(username=assigned_users_param)
-            )
-            tasks = Task.objects.filter(assigned_users=assigned_users)
-        except CustomUser.DoesNotExist:
-            return Response(
-                {"error": "No hay un usuario asignado"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-    else:
-        tasks = Task.objects.all()
-
-    serializer = TaskReadSerializer(tasks, many=True)
-    return Response(serializer.data)
+    return filtered_task_response(request, request.GET)
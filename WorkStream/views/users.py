@@ -1,14 +1,35 @@
+import json
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
 from rest_framework import generics, status, viewsets
-from rest_framework.permissions import AllowAny
+from rest_framework.pagination import _positive_int
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenRefreshView
 
+from WorkStream.autocomplete import autocomplete_users
+from WorkStream.login import ExecutorSaturated, authenticate_async
 from WorkStream.models import CustomUser
 from WorkStream.permissions import IsAuthenticatedOrReadOnly
-from WorkStream.serializers import CustomUserSerializer, LoginSerializer
+from WorkStream.serializers import (
+    CustomUserSerializer,
+    LoginSerializer,
+    TokenRefreshSerializer,
+    UserAutocompleteSerializer,
+)
+from WorkStream.tokens import WorkStreamRefreshToken
+
+logger = logging.getLogger(__name__)
 
 
 @method_decorator(
@@ -78,6 +99,51 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         serializer.save()
 
 
+class UserAutocompleteAPIView(APIView):
+
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Autocompletado de usuarios por prefijo de username, nombre o "
+            "email. Devuelve los primeros resultados en formato compacto."
+        ),
+        manual_parameters=[
+            openapi.Parameter(
+                "q",
+                openapi.IN_QUERY,
+                description="Texto escrito por el usuario",
+                type=openapi.TYPE_STRING,
+            ),
+            openapi.Parameter(
+                "limit",
+                openapi.IN_QUERY,
+                description="Cantidad máxima de resultados",
+                type=openapi.TYPE_INTEGER,
+            ),
+        ],
+        responses={200: UserAutocompleteSerializer(many=True)},
+    )
+    def get(self, request):
+        term = request.query_params.get("q", "").strip()
+        if not term:
+            return Response([])
+        try:
+            limit = _positive_int(
+                request.query_params["limit"],
+                strict=True,
+                cutoff=getattr(settings, "WORKSTREAM_AUTOCOMPLETE_MAX_LIMIT", 50),
+            )
+        except (KeyError, ValueError):
+            limit = getattr(settings, "WORKSTREAM_AUTOCOMPLETE_LIMIT", 10)
+        rows = autocomplete_users(term, limit)
+        return Response(
+            UserAutocompleteSerializer(
+                rows, many=True, context={"request": request}
+            ).data
+        )
+
+
 class RegisterAPIView(generics.CreateAPIView):
 
     queryset = CustomUser.objects.all()
@@ -93,26 +159,102 @@ class RegisterAPIView(generics.CreateAPIView):
         return super().post(request, *args, **kwargs)
 
 
-class LoginAPIView(APIView):
-    permission_classes = [AllowAny]
-    serializer_class = LoginSerializer
+def json_response(data, status_code, headers=None):
+    # Respuesta de DRF renderizada como JSON fuera de una APIView
+    response = Response(data, status=status_code, headers=headers)
+    response.accepted_renderer = JSONRenderer()
+    response.accepted_media_type = "application/json"
+    response.renderer_context = {}
+    return response
 
-    @swagger_auto_schema(
-        operation_description="Inician sesión los usuarios.",
-        request_body=LoginSerializer,
-        responses={200: "OK", 400: "Bad Request"},
-    )
-    def post(self, request):
 
-        serializer = LoginSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        user = serializer.validated_data["user"]
-        refresh = RefreshToken.for_user(user)
+class LoginAPIView(View):
+    """
+    Login asíncrono. `authenticate()` corre en un pool de hilos acotado
+    (`WorkStream.login`); si el pool está saturado se responde 503 con
+    Retry-After en lugar de encolar el pedido. Al no ser una vista de DRF,
+    su operación se agrega al esquema en `WorkStream.urls`.
+    """
 
-        return Response(
-            {
-                "refresh": str(refresh),
-                "access": str(refresh.access_token),
-            },
-            status=status.HTTP_200_OK,
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def post(self, request):
+        started = time.perf_counter()
+        if request.content_type == "application/json":
+            try:
+                data = json.loads(request.body or b"{}")
+            except ValueError:
+                return json_response(
+                    {"detail": "JSON inválido"}, status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            data = request.POST
+
+        serializer = LoginSerializer(data=data)
+        if not serializer.is_valid():
+            return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        try:
+            user, waited, authenticated = await authenticate_async(
+                request,
+                username=serializer.validated_data["username"],
+                password=serializer.validated_data["password"],
+            )
+        except ExecutorSaturated:
+            logger.warning("login rechazado: pool de verificación saturado")
+            return json_response(
+                {"detail": "Demasiados inicios de sesión, reintente en breve."},
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={
+                    "Retry-After": str(
+                        getattr(settings, "WORKSTREAM_LOGIN_RETRY_AFTER", 1)
+                    )
+                },
+            )
+
+        if user is None:
+            response = json_response(
+                {"non_field_errors": ["Incorrect username or password."]},
+                status.HTTP_400_BAD_REQUEST,
+            )
+        else:
+            refresh = await sync_to_async(WorkStreamRefreshToken.for_user)(user)
+            response = json_response(
+                {
+                    "refresh": str(refresh),
+                    "access": str(refresh.access_token),
+                },
+                status.HTTP_200_OK,
+            )
+
+        total = time.perf_counter() - started
+        response["Server-Timing"] = (
+            f"queue;dur={waited * 1000:.1f}, auth;dur={authenticated * 1000:.1f}, "
+            f"total;dur={total * 1000:.1f}"
         )
+        logger.info(
+            "login %s en %.1f ms (cola %.1f ms, autenticación %.1f ms)",
+            "correcto" if user else "fallido",
+            total * 1000,
+            waited * 1000,
+            authenticated * 1000,
+        )
+        return response
+
+
+class RefreshTokenAPIView(TokenRefreshView):
+
+    serializer_class = TokenRefreshSerializer
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Renueva el access token. El refresh token enviado queda "
+            "consumido y se devuelve uno nuevo."
+        ),
+        request_body=TokenRefreshSerializer,
+        responses={200: TokenRefreshSerializer, 401: "Unauthorized"},
+    )
+    def post(self, request, *args, **kwargs):
+        return super().post(request, *args, **kwargs)
@@ -45,6 +45,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "WorkStream",
     "rest_framework",
     "rest_framework_simplejwt",
@@ -145,9 +146,9 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "WorkStream.authentication.StatelessJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.BasicAuthentication",
+        "WorkStream.authentication.CachedBasicAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
@@ -160,3 +161,73 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
 }
+
+# Paginación por cursor de los listados de tareas
+WORKSTREAM_PAGE_SIZE = 50
+WORKSTREAM_MAX_PAGE_SIZE = 500
+
+# Caché de los listados de tareas y de las versiones de estados, prioridades y
+# tokens. Con más de un proceso hace falta un backend compartido (p. ej. Redis o
+# Memcached) vía variables de entorno: con LocMem cada proceso solo ve sus
+# propios cambios (check WorkStream.W001).
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "workstream"),
+    }
+}
+# Segundos que vive un listado cacheado. Cualquier escritura sobre tareas,
+# comentarios, estados, prioridades o usuarios invalida todos los listados
+# (ver WorkStream.cache.invalidate_task_lists)
+WORKSTREAM_TASK_CACHE_TIMEOUT = 300
+# Copia de respaldo que se sirve si la base de datos falla (0 la desactiva)
+WORKSTREAM_TASK_CACHE_STALE_TIMEOUT = 3600
+# Segundos que cada proceso usa su copia de estados y prioridades aunque no
+# vea un cambio de versión (respaldo para cachés no compartidas)
+WORKSTREAM_REFERENCE_CACHE_TTL = 60
+
+# Tamaño de bloque de las operaciones masivas sobre tareas
+WORKSTREAM_BULK_BATCH_SIZE = 1000
+# Comentarios por sentencia al borrar tareas en bloque
+WORKSTREAM_BULK_COMMENT_BATCH_SIZE = 5000
+
+# Máximo de comentarios por pedido en /comments/batch/
+WORKSTREAM_COMMENT_BATCH_MAX = 500
+
+# Hasheo de contraseñas en paralelo para el alta masiva de usuarios
+WORKSTREAM_HASHING_WORKERS = min(os.cpu_count() or 1, 4)
+WORKSTREAM_HASHING_MIN_BATCH = 8
+
+# Verificación de contraseñas en el login: hilos dedicados y cola acotada.
+# Con la cola llena el login responde 503 con Retry-After.
+WORKSTREAM_LOGIN_WORKERS = min(os.cpu_count() or 1, 4)
+WORKSTREAM_LOGIN_MAX_PENDING = 32
+WORKSTREAM_LOGIN_RETRY_AFTER = 1
+
+# Autenticación JWT sin estado: segundos que cada proceso confía en la versión
+# de tokens de un usuario antes de volver a consultarla
+WORKSTREAM_AUTH_LOCAL_TTL = 5
+WORKSTREAM_AUTH_SHARED_TTL = 300
+
+# Autenticación Basic: segundos que se recuerda una verificación de
+# credenciales correcta
+WORKSTREAM_BASIC_AUTH_TTL = 60
+
+# Configuración de texto de PostgreSQL para la búsqueda de /search/
+WORKSTREAM_SEARCH_CONFIG = "spanish"
+# Comentarios por tarea que entran en el índice de búsqueda (los primeros) y
+# caracteres indexados de cada uno; PostgreSQL limita un tsvector a 1 MB
+WORKSTREAM_SEARCH_MAX_COMMENTS = 100
+WORKSTREAM_SEARCH_COMMENT_CHARS = 1000
+
+# Autocompletado de usuarios: resultados por defecto y máximos, y segundos
+# que cada proceso recuerda un prefijo consultado
+WORKSTREAM_AUTOCOMPLETE_LIMIT = 10
+WORKSTREAM_AUTOCOMPLETE_MAX_LIMIT = 50
+WORKSTREAM_AUTOCOMPLETE_TTL = 30
+
+# Resumen de /tasks/stats/ mantenido al guardar y borrar tareas. Al activarlo
+# hay que correr `manage.py rebuild_task_stats` para cargar los contadores.
+WORKSTREAM_TASK_STATS_SUMMARY = False